@@ -1,22 +1,66 @@
 """Flask application factory for the ConstruyeSeguro platform."""
 from pathlib import Path
+from typing import Any
+
 from flask import Flask, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+
+try:  # orjson is optional; Flask's stdlib-based provider is used when it is missing.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 from . import database
 from .routes import api_bp
 
+BACKEND_DIR = Path(__file__).resolve().parent
+FRONTEND_DIR = BACKEND_DIR.parent / "frontend"
+DEFAULT_PROJECT_STORAGE = BACKEND_DIR / "generated"
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes responses and parses request bodies with orjson.
+
+    Calls that pass stdlib-specific keyword arguments (``indent``, ``cls``...)
+    and pretty-printed debug responses fall back to the default provider.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+
+    def _encode(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+
 
 def create_app(test_config: dict | None = None) -> Flask:
     """Create and configure the Flask application."""
     app = Flask(
         __name__,
-        static_folder=str(Path(__file__).resolve().parent.parent / "frontend"),
+        static_folder=str(FRONTEND_DIR),
         static_url_path="",
     )
     app.config.from_mapping(
-        PROJECT_STORAGE=Path(__file__).resolve().parent / "generated",
+        PROJECT_STORAGE=DEFAULT_PROJECT_STORAGE,
+        # Internal Nginx location aliased to PROJECT_STORAGE, e.g. "/protected-pdfs/".
+        MANUAL_ACCEL_REDIRECT_PREFIX=None,
     )
 
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
     if test_config is not None:
         app.config.update(test_config)
 
@@ -0,0 +1,223 @@
+"""Example rows used to seed the lookup tables on first start."""
+from __future__ import annotations
+
+ARCHITECTS_COLUMNS = ("name", "specialty", "price_range", "city", "portfolio_url", "rating")
+ARCHITECTS = (
+    (
+        "Arq. Sofía Méndez",
+        "Vivienda sostenible",
+        "$15,000 - $25,000",
+        "Ciudad de México",
+        "https://portfolio.arqsofia.mx",
+        4.9,
+    ),
+    (
+        "Arq. Luis Herrera",
+        "Espacios comerciales y vivienda",
+        "$12,000 - $20,000",
+        "Guadalajara",
+        "https://luisherrera.studio",
+        4.7,
+    ),
+    (
+        "Arq. Daniela Flores",
+        "Diseño bioclimático",
+        "$18,000 - $30,000",
+        "Mérida",
+        "https://danielaflores.mx",
+        4.8,
+    ),
+)
+
+SUPPLIERS_COLUMNS = (
+    "name",
+    "address",
+    "city",
+    "contact",
+    "material_focus",
+    "latitude",
+    "longitude",
+    "rating",
+)
+SUPPLIERS = (
+    (
+        "Materiales Rivera",
+        "Av. Central 123",
+        "Puebla",
+        "222-555-0192",
+        "Block y cemento",
+        19.0413,
+        -98.2062,
+        4.6,
+    ),
+    (
+        "EcoMaderas del Sur",
+        "Carretera 45 km 12",
+        "Oaxaca",
+        "951-332-1188",
+        "Madera tratada",
+        17.0594,
+        -96.7216,
+        4.4,
+    ),
+    (
+        "Hormigón Express",
+        "Calle 5 de Mayo 87",
+        "Monterrey",
+        "81-2456-7722",
+        "Concreto premezclado",
+        25.6866,
+        -100.3161,
+        4.2,
+    ),
+)
+
+FINANCING_PRODUCTS_COLUMNS = (
+    "name",
+    "provider",
+    "rate",
+    "term_months",
+    "product_type",
+    "requirements",
+)
+FINANCING_PRODUCTS = (
+    (
+        "Crédito Construye Contigo",
+        "Finanzas Azteca",
+        12.5,
+        120,
+        "Hipotecario",
+        "Comprobación de ingresos, aval, historial crediticio positivo",
+    ),
+    (
+        "Microcrédito Materiales",
+        "Cooperativa Unión",
+        18.0,
+        36,
+        "Microfinanzas",
+        "Identificación oficial, comprobante de domicilio, plan de obra",
+    ),
+    (
+        "GreenHome Plus",
+        "Banco Sustentable",
+        9.8,
+        180,
+        "Hipotecario verde",
+        "Uso de materiales certificados y diseño bioclimático",
+    ),
+)
+
+PROVIDERS_COLUMNS = (
+    "name",
+    "provider_type",
+    "specialty",
+    "city",
+    "locality",
+    "price_min",
+    "price_max",
+    "rating",
+    "description",
+    "contact",
+    "portfolio_url",
+    "experience_years",
+)
+PROVIDERS = (
+    (
+        "Arq. Sofía Méndez",
+        "arquitectura",
+        "Vivienda sostenible",
+        "Ciudad de México",
+        "Iztapalapa",
+        15000,
+        25000,
+        4.9,
+        "Diseños bioclimáticos con enfoque en autoconstrucción asistida.",
+        "contacto@arqsofia.mx",
+        "https://portfolio.arqsofia.mx",
+        12,
+    ),
+    (
+        "Ing. Luis Herrera",
+        "asesoría",
+        "Supervisión estructural",
+        "Guadalajara",
+        "Tonalá",
+        8000,
+        15000,
+        4.7,
+        "Acompañamiento técnico para cimentación y estructura ligera.",
+        "hola@lhuconsultores.com",
+        "https://lhuconsultores.com",
+        15,
+    ),
+    (
+        "Ferretería El Puente",
+        "materiales",
+        "Materiales y herramientas",
+        "Puebla",
+        "Cholula",
+        500,
+        8000,
+        4.5,
+        "Entrega a obra y paquetes especiales para autoconstructores.",
+        "ventas@ferreteriaelpuente.mx",
+        "https://ferreteriaelpuente.mx",
+        20,
+    ),
+    (
+        "Constructora Norte",
+        "arquitectura",
+        "Planos ejecutivos y permisos",
+        "Monterrey",
+        "Centro",
+        18000,
+        32000,
+        4.8,
+        "Equipo multidisciplinario especializado en vivienda progresiva.",
+        "contacto@constructoranorte.mx",
+        "https://constructoranorte.mx",
+        18,
+    ),
+    (
+        "Materiales Rivera",
+        "materiales",
+        "Concreto y block",
+        "Querétaro",
+        "San Pedro",
+        400,
+        6000,
+        4.6,
+        "Proveedores certificados con logística para zonas rurales.",
+        "ventas@materialesrivera.com",
+        "https://materialesrivera.com",
+        22,
+    ),
+)
+
+TESTIMONIALS_COLUMNS = ("author", "location", "quote")
+TESTIMONIALS = (
+    (
+        "María y Antonio",
+        "Querétaro",
+        "Gracias a ConstruyeSeguro pudimos diseñar nuestra casa y terminarla en menos de 9 meses.",
+    ),
+    (
+        "Familia López",
+        "Chiapas",
+        "Las asesorías en línea nos ayudaron a evitar errores costosos en la estructura.",
+    ),
+    (
+        "Rocío",
+        "Jalisco",
+        "Los manuales paso a paso y los videos fueron clave para coordinar a nuestro equipo.",
+    ),
+)
+
+# (table, columns, rows) in the order the tables are seeded.
+SEED_TABLES = (
+    ("architects", ARCHITECTS_COLUMNS, ARCHITECTS),
+    ("suppliers", SUPPLIERS_COLUMNS, SUPPLIERS),
+    ("financing_products", FINANCING_PRODUCTS_COLUMNS, FINANCING_PRODUCTS),
+    ("providers", PROVIDERS_COLUMNS, PROVIDERS),
+    ("testimonials", TESTIMONIALS_COLUMNS, TESTIMONIALS),
+)
@@ -1,406 +1,355 @@
 """SQLite database helpers for ConstruyeSeguro."""
 from __future__ import annotations
 
+import atexit
+import hashlib
 import json
+import logging
+import os
+import queue
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import chain, count, product
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
 
+from .data.sample_data import SEED_TABLES
 from .data.video_catalog import VIDEO_CATALOG
 
-DB_PATH = Path(__file__).resolve().parent.parent / "construyeseguro.db"
+try:  # orjson is optional; the stdlib encoder is used when it is missing.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
+DB_PATH = Path(__file__).resolve().parent.parent / "construyeseguro.db"
 
-def get_connection() -> sqlite3.Connection:
-    connection = sqlite3.connect(DB_PATH)
+# Idempotent DDL (``CREATE ... IF NOT EXISTS``) kept next to this module.
+SCHEMA_SQL = (Path(__file__).resolve().parent / "schema.sql").read_text(encoding="utf-8")
+
+# ``journal_mode`` is persisted in the database file itself, so it is applied
+# once per process from ``init_db``. WAL can be swapped for the default rollback
+# journal (``DELETE``) through the environment, e.g. for throwaway test databases.
+JOURNAL_MODE = os.environ.get("CONSTRUYESEGURO_JOURNAL_MODE", "WAL").upper()
+if JOURNAL_MODE not in {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}:
+    raise ValueError(f"Modo de journal de SQLite no soportado: {JOURNAL_MODE}")
+
+# Connection-scoped settings applied to every new handle.
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Size of sqlite3's per-connection LRU of prepared statements. Hot queries are
+# kept as module-level constants below so every call hits the same cache entry.
+STATEMENT_CACHE_SIZE = 256
+
+# Idle read-only connections kept for reuse; extra ones opened under load are
+# closed when returned to a full pool.
+READ_POOL_SIZE = min(32, (os.cpu_count() or 1) * 2)
+
+# Rows per multi-row INSERT in bulk helpers; 50 rows x 7 columns stays well
+# below SQLite's bound-parameter limit.
+BULK_INSERT_CHUNK = 50
+
+# Watch events are buffered and written with one ``executemany`` per batch.
+WATCH_BUFFER_SIZE = 64
+# A batch that fails to write is requeued this many times before it is dropped.
+WATCH_FLUSH_RETRIES = 3
+
+# Resolved token -> user lookups are kept in-process for a short time because
+# ``get_user_by_token`` runs on every authenticated request.
+SESSION_CACHE_TTL = 60.0
+SESSION_CACHE_SIZE = 4096
+
+# The catalog size is reset whenever this process reloads the catalog; the TTL
+# only bounds staleness after ``seed_videos.py`` reloads it from another process.
+VIDEO_COUNT_TTL = 60.0
+
+# Project writes carry the largest payloads; every this many of them the WAL
+# is checkpointed and truncated so it cannot grow without bound when readers
+# keep the automatic checkpoints from completing.
+WAL_CHECKPOINT_INTERVAL = 1000
+
+_logger = logging.getLogger(__name__)
+_journal_configured = False
+_total_videos: tuple[float, int] | None = None
+_writer: sqlite3.Connection | None = None
+_writer_lock = threading.RLock()
+_read_pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=READ_POOL_SIZE)
+_session_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+_session_cache_lock = threading.Lock()
+_pending_watches: list[tuple[int, int]] = []
+_pending_watches_lock = threading.Lock()
+_watch_flush_lock = threading.Lock()
+_watch_flush_failures = 0
+_project_writes = count(1)
+
+
+@contextmanager
+def get_writer() -> Iterator[sqlite3.Connection]:
+    """Hold the process-wide read/write connection for the duration of the block.
+
+    SQLite admits one writer at a time, so every write shares a single
+    long-lived handle behind a lock instead of each request thread opening its
+    own. The handle runs in autocommit mode: single statements commit on their
+    own, and writes spanning several statements go through ``transaction``.
+    The lock is reentrant so helpers can nest.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = _connect(DB_PATH, check_same_thread=False)
+        yield _writer
+
+
+@contextmanager
+def get_reader() -> Iterator[sqlite3.Connection]:
+    """Borrow a read-only connection from the pool used by SELECT helpers.
+
+    Under WAL, readers never block the writer, so lookups run on long-lived
+    ``mode=ro`` handles that are shared across threads one borrower at a time.
+    """
+    try:
+        connection = _read_pool.get_nowait()
+    except queue.Empty:
+        uri = f"{Path(DB_PATH).resolve().as_uri()}?mode=ro"
+        connection = _connect(uri, uri=True, check_same_thread=False)
+    try:
+        yield connection
+    finally:
+        try:
+            _read_pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+
+@contextmanager
+def transaction(immediate: bool = False) -> Iterator[sqlite3.Connection]:
+    """Run the block in one explicit transaction on the writer connection.
+
+    ``immediate`` takes the write lock up front instead of on the first write.
+    The transaction commits when the block exits and rolls back on error.
+    """
+    with get_writer() as connection, connection:
+        connection.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        yield connection
+
+
+@contextmanager
+def bulk_load(*checked_tables: str) -> Iterator[sqlite3.Connection]:
+    """Run a bulk write in one ``IMMEDIATE`` transaction without FK checks.
+
+    Foreign-key enforcement is switched off for the load and restored
+    afterwards. Child tables named in ``checked_tables`` are validated once
+    with ``PRAGMA foreign_key_check`` before committing; any violation rolls
+    the whole load back.
+    """
+    with get_writer() as connection:
+        # The pragma is a no-op inside a transaction, so it is set before BEGIN.
+        connection.execute("PRAGMA foreign_keys = OFF")
+        try:
+            with transaction(immediate=True):
+                yield connection
+                for table in checked_tables:
+                    if connection.execute(f"PRAGMA foreign_key_check({table})").fetchone():
+                        raise sqlite3.IntegrityError(f"Referencias inválidas en la tabla {table}")
+        finally:
+            connection.execute("PRAGMA foreign_keys = ON")
+
+
+def _connect(database: str | Path, **kwargs: Any) -> sqlite3.Connection:
+    connection = sqlite3.connect(
+        database, isolation_level=None, cached_statements=STATEMENT_CACHE_SIZE, **kwargs
+    )
     connection.row_factory = sqlite3.Row
-    connection.execute("PRAGMA foreign_keys = ON")
+    for pragma in CONNECTION_PRAGMAS:
+        connection.execute(pragma)
     return connection
 
 
-def _ensure_column(connection: sqlite3.Connection, table: str, column: str, alter_sql: str) -> None:
-    """Add a column to an existing table when seeding legacy databases."""
-    columns = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
-    if column not in columns:
-        connection.execute(alter_sql)
+def close_connection() -> None:
+    """Close the shared writer connection, if it was opened.
+
+    ``PRAGMA optimize`` runs first so statistics gathered during the process
+    lifetime are persisted for the query planner.
+    """
+    global _writer
+    with _writer_lock:
+        connection, _writer = _writer, None
+        if connection is not None:
+            try:
+                connection.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            connection.close()
+
+
+def close_read_connections() -> None:
+    """Close every idle connection in the read-only pool."""
+    while True:
+        try:
+            connection = _read_pool.get_nowait()
+        except queue.Empty:
+            return
+        connection.close()
+
+
+atexit.register(close_connection)
+atexit.register(close_read_connections)
+
+
+def _checkpoint_if_due() -> None:
+    """Truncate the WAL after every ``WAL_CHECKPOINT_INTERVAL`` project writes."""
+    if JOURNAL_MODE == "WAL" and next(_project_writes) % WAL_CHECKPOINT_INTERVAL == 0:
+        with get_writer() as connection:
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def _dump_json(value: Any) -> bytes:
+    """Encode ``value`` as compact UTF-8 JSON bytes, stored as a BLOB.
+
+    The stdlib fallback uses the same separators as orjson so both encoders
+    produce identical payloads.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _load_json(raw: str | bytes) -> Any:
+    """Decode a JSON column; rows written before the BLOB switch are TEXT."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# Columns added after the first release; older databases receive them through
+# ``ALTER TABLE`` before the schema script runs, since its indexes need them.
+_ADDED_COLUMNS = (
+    ("users", "city", "TEXT"),
+    ("users", "project_type", "TEXT"),
+    ("videos", "stage", "TEXT"),
+    ("videos", "tags", "TEXT"),
+    (
+        "videos",
+        "level_order",
+        "INTEGER GENERATED ALWAYS AS (CASE LOWER(level) WHEN 'principiante' THEN 0 "
+        "WHEN 'intermedio' THEN 1 WHEN 'avanzado' THEN 2 ELSE 3 END) VIRTUAL",
+    ),
+)
+
+
+def _missing_column_alters(connection: sqlite3.Connection) -> list[str]:
+    """Return the ``ALTER TABLE`` statements existing tables still need.
+
+    Every affected table is inspected with one ``pragma_table_xinfo`` join,
+    which also lists generated columns; tables that do not exist yet are left
+    to the schema script.
+    """
+    tables = sorted({table for table, _, _ in _ADDED_COLUMNS})
+    rows = connection.execute(
+        "SELECT m.name, p.name FROM sqlite_master AS m JOIN pragma_table_xinfo(m.name) AS p "
+        f"WHERE m.type = 'table' AND m.name IN ({', '.join('?' * len(tables))})",
+        tables,
+    )
+    existing: dict[str, set[str]] = {}
+    for table, column in rows:
+        existing.setdefault(table, set()).add(column)
+    return [
+        f"ALTER TABLE {table} ADD COLUMN {column} {declaration};"
+        for table, column, declaration in _ADDED_COLUMNS
+        if table in existing and column not in existing[table]
+    ]
 
 
 def init_db() -> None:
-    """Create all required tables if they do not exist."""
-    with get_connection() as connection:
-        connection.executescript(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT NOT NULL UNIQUE,
-                password_hash TEXT NOT NULL,
-                full_name TEXT,
-                city TEXT,
-                project_type TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS sessions (
-                token TEXT PRIMARY KEY,
-                user_id INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS user_projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                form_data TEXT NOT NULL,
-                plan_data TEXT NOT NULL,
-                viability REAL NOT NULL,
-                manual_path TEXT,
-                status TEXT NOT NULL DEFAULT 'En preparación',
-                progress REAL NOT NULL DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS video_watch_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                video_id INTEGER NOT NULL,
-                watched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE (user_id, video_id),
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS manual_downloads (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                project_id INTEGER NOT NULL,
-                downloaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                FOREIGN KEY (project_id) REFERENCES user_projects(id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                form_data TEXT NOT NULL,
-                results TEXT NOT NULL,
-                viability REAL NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS architects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                specialty TEXT NOT NULL,
-                price_range TEXT NOT NULL,
-                city TEXT NOT NULL,
-                portfolio_url TEXT,
-                rating REAL NOT NULL DEFAULT 4.5
-            );
-
-            CREATE TABLE IF NOT EXISTS suppliers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                address TEXT NOT NULL,
-                city TEXT NOT NULL,
-                contact TEXT NOT NULL,
-                material_focus TEXT NOT NULL,
-                latitude REAL,
-                longitude REAL,
-                rating REAL NOT NULL DEFAULT 4.0
-            );
-
-            CREATE TABLE IF NOT EXISTS financing_products (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                rate REAL NOT NULL,
-                term_months INTEGER NOT NULL,
-                product_type TEXT NOT NULL,
-                requirements TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS videos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                category TEXT NOT NULL,
-                youtube_id TEXT NOT NULL,
-                level TEXT NOT NULL,
-                stage TEXT,
-                description TEXT NOT NULL,
-                manual_step TEXT,
-                tags TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS providers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                provider_type TEXT NOT NULL,
-                specialty TEXT,
-                city TEXT NOT NULL,
-                locality TEXT,
-                price_min REAL,
-                price_max REAL,
-                rating REAL DEFAULT 4.6,
-                description TEXT,
-                contact TEXT,
-                portfolio_url TEXT,
-                experience_years INTEGER DEFAULT 0
-            );
-
-            CREATE TABLE IF NOT EXISTS project_hires (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                project_id INTEGER NOT NULL,
-                provider_id INTEGER NOT NULL,
-                message TEXT,
-                status TEXT NOT NULL DEFAULT 'pendiente',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                FOREIGN KEY (project_id) REFERENCES user_projects(id) ON DELETE CASCADE,
-                FOREIGN KEY (provider_id) REFERENCES providers(id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS testimonials (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                author TEXT NOT NULL,
-                location TEXT NOT NULL,
-                quote TEXT NOT NULL
-            );
-            """
-        )
+    """Create all required tables if they do not exist.
 
-        _ensure_column(connection, "users", "city", "ALTER TABLE users ADD COLUMN city TEXT")
-        _ensure_column(
-            connection,
-            "users",
-            "project_type",
-            "ALTER TABLE users ADD COLUMN project_type TEXT",
-        )
-        _ensure_column(connection, "videos", "stage", "ALTER TABLE videos ADD COLUMN stage TEXT")
-        _ensure_column(connection, "videos", "tags", "ALTER TABLE videos ADD COLUMN tags TEXT")
+    Column migrations and the schema script run as one transaction, so a
+    failure leaves the database exactly as it was.
+    """
+    global _journal_configured
+    with get_writer() as connection:
+        if not _journal_configured:
+            connection.execute(f"PRAGMA journal_mode = {JOURNAL_MODE}")
+            _journal_configured = True
+        script = "\n".join(["BEGIN;", *_missing_column_alters(connection), SCHEMA_SQL, "COMMIT;"])
+        try:
+            connection.executescript(script)
+        except sqlite3.Error:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        connection.execute("PRAGMA optimize")
 
 
-def seed_data() -> None:
-    """Populate lookup tables with example data when empty."""
-    with get_connection() as connection:
-        if not _has_rows(connection, "architects"):
-            connection.executemany(
-                """
-                INSERT INTO architects (name, specialty, price_range, city, portfolio_url, rating)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                [
-                    (
-                        "Arq. Sofía Méndez",
-                        "Vivienda sostenible",
-                        "$15,000 - $25,000",
-                        "Ciudad de México",
-                        "https://portfolio.arqsofia.mx",
-                        4.9,
-                    ),
-                    (
-                        "Arq. Luis Herrera",
-                        "Espacios comerciales y vivienda",
-                        "$12,000 - $20,000",
-                        "Guadalajara",
-                        "https://luisherrera.studio",
-                        4.7,
-                    ),
-                    (
-                        "Arq. Daniela Flores",
-                        "Diseño bioclimático",
-                        "$18,000 - $30,000",
-                        "Mérida",
-                        "https://danielaflores.mx",
-                        4.8,
-                    ),
-                ],
-            )
+_SQL_IS_SEEDED = "SELECT 1 FROM meta WHERE key = 'seeded'"
 
-        if not _has_rows(connection, "suppliers"):
-            connection.executemany(
-                """
-                INSERT INTO suppliers (name, address, city, contact, material_focus, latitude, longitude, rating)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                [
-                    (
-                        "Materiales Rivera",
-                        "Av. Central 123",
-                        "Puebla",
-                        "222-555-0192",
-                        "Block y cemento",
-                        19.0413,
-                        -98.2062,
-                        4.6,
-                    ),
-                    (
-                        "EcoMaderas del Sur",
-                        "Carretera 45 km 12",
-                        "Oaxaca",
-                        "951-332-1188",
-                        "Madera tratada",
-                        17.0594,
-                        -96.7216,
-                        4.4,
-                    ),
-                    (
-                        "Hormigón Express",
-                        "Calle 5 de Mayo 87",
-                        "Monterrey",
-                        "81-2456-7722",
-                        "Concreto premezclado",
-                        25.6866,
-                        -100.3161,
-                        4.2,
-                    ),
-                ],
-            )
+_SQL_MARK_SEEDED = "INSERT OR IGNORE INTO meta (key, value) VALUES ('seeded', '1')"
 
-        if not _has_rows(connection, "financing_products"):
-            connection.executemany(
-                """
-                INSERT INTO financing_products (name, provider, rate, term_months, product_type, requirements)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                [
-                    (
-                        "Crédito Construye Contigo",
-                        "Finanzas Azteca",
-                        12.5,
-                        120,
-                        "Hipotecario",
-                        "Comprobación de ingresos, aval, historial crediticio positivo",
-                    ),
-                    (
-                        "Microcrédito Materiales",
-                        "Cooperativa Unión",
-                        18.0,
-                        36,
-                        "Microfinanzas",
-                        "Identificación oficial, comprobante de domicilio, plan de obra",
-                    ),
-                    (
-                        "GreenHome Plus",
-                        "Banco Sustentable",
-                        9.8,
-                        180,
-                        "Hipotecario verde",
-                        "Uso de materiales certificados y diseño bioclimático",
-                    ),
-                ],
-            )
+_SQL_POPULATED_TABLES = "SELECT " + ", ".join(
+    f"EXISTS (SELECT 1 FROM {table})" for table, _, _ in SEED_TABLES
+)
 
-        if not _has_rows(connection, "providers"):
-            connection.executemany(
-                """
-                INSERT INTO providers (
-                    name, provider_type, specialty, city, locality, price_min, price_max, rating, description, contact, portfolio_url, experience_years
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                [
-                    (
-                        "Arq. Sofía Méndez",
-                        "arquitectura",
-                        "Vivienda sostenible",
-                        "Ciudad de México",
-                        "Iztapalapa",
-                        15000,
-                        25000,
-                        4.9,
-                        "Diseños bioclimáticos con enfoque en autoconstrucción asistida.",
-                        "contacto@arqsofia.mx",
-                        "https://portfolio.arqsofia.mx",
-                        12,
-                    ),
-                    (
-                        "Ing. Luis Herrera",
-                        "asesoría",
-                        "Supervisión estructural",
-                        "Guadalajara",
-                        "Tonalá",
-                        8000,
-                        15000,
-                        4.7,
-                        "Acompañamiento técnico para cimentación y estructura ligera.",
-                        "hola@lhuconsultores.com",
-                        "https://lhuconsultores.com",
-                        15,
-                    ),
-                    (
-                        "Ferretería El Puente",
-                        "materiales",
-                        "Materiales y herramientas",
-                        "Puebla",
-                        "Cholula",
-                        500,
-                        8000,
-                        4.5,
-                        "Entrega a obra y paquetes especiales para autoconstructores.",
-                        "ventas@ferreteriaelpuente.mx",
-                        "https://ferreteriaelpuente.mx",
-                        20,
-                    ),
-                    (
-                        "Constructora Norte",
-                        "arquitectura",
-                        "Planos ejecutivos y permisos",
-                        "Monterrey",
-                        "Centro",
-                        18000,
-                        32000,
-                        4.8,
-                        "Equipo multidisciplinario especializado en vivienda progresiva.",
-                        "contacto@constructoranorte.mx",
-                        "https://constructoranorte.mx",
-                        18,
-                    ),
-                    (
-                        "Materiales Rivera",
-                        "materiales",
-                        "Concreto y block",
-                        "Querétaro",
-                        "San Pedro",
-                        400,
-                        6000,
-                        4.6,
-                        "Proveedores certificados con logística para zonas rurales.",
-                        "ventas@materialesrivera.com",
-                        "https://materialesrivera.com",
-                        22,
-                    ),
-                ],
-            )
 
+def seed_data() -> None:
+    """Populate lookup tables with example data and refresh the video catalog.
+
+    A ``seeded`` row in ``meta`` marks the lookup tables as populated, so
+    later starts skip their per-table probes. Everything runs inside one
+    ``bulk_load`` transaction so a cold start pays a single commit. Its
+    ``IMMEDIATE`` lock is taken before the probes, so two processes starting
+    together cannot both read "not seeded" and then fail to upgrade their
+    locks.
+    """
+    with bulk_load() as connection:
+        if connection.execute(_SQL_IS_SEEDED).fetchone() is None:
+            _seed_lookup_tables(connection)
+            connection.execute(_SQL_MARK_SEEDED)
         _seed_video_catalog(connection)
 
-        if not _has_rows(connection, "testimonials"):
-            connection.executemany(
-                """
-                INSERT INTO testimonials (author, location, quote)
-                VALUES (?, ?, ?)
-                """,
-                [
-                    (
-                        "María y Antonio",
-                        "Querétaro",
-                        "Gracias a ConstruyeSeguro pudimos diseñar nuestra casa y terminarla en menos de 9 meses.",
-                    ),
-                    (
-                        "Familia López",
-                        "Chiapas",
-                        "Las asesorías en línea nos ayudaron a evitar errores costosos en la estructura.",
-                    ),
-                    (
-                        "Rocío",
-                        "Jalisco",
-                        "Los manuales paso a paso y los videos fueron clave para coordinar a nuestro equipo.",
-                    ),
-                ],
-            )
+
+def _seed_lookup_tables(connection: sqlite3.Connection) -> None:
+    """Insert the example rows into every lookup table that is still empty.
+
+    Only databases created before the ``seeded`` flag reach this point, and a
+    single compound probe tells which of their tables already hold rows.
+    """
+    populated = connection.execute(_SQL_POPULATED_TABLES).fetchone()
+    for (table, columns, rows), has_rows in zip(SEED_TABLES, populated):
+        if not has_rows:
+            _bulk_insert(connection, table, columns, rows)
+
+
+def _bulk_insert(
+    connection: sqlite3.Connection,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    *,
+    on_conflict: str = "",
+) -> None:
+    """Insert ``rows`` with multi-row ``INSERT ... VALUES`` statements.
+
+    Rows are sent ``BULK_INSERT_CHUNK`` at a time, so each chunk is a single
+    prepare and step instead of one step per row. ``on_conflict`` is appended
+    verbatim as an upsert clause.
+    """
+    row_placeholders = f"({', '.join('?' * len(columns))})"
+    for start in range(0, len(rows), BULK_INSERT_CHUNK):
+        chunk = rows[start : start + BULK_INSERT_CHUNK]
+        connection.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES {', '.join([row_placeholders] * len(chunk))} {on_conflict}",
+            list(chain.from_iterable(chunk)),
+        )
 
 
 def create_user(
@@ -411,69 +360,110 @@ def create_user(
     city: str | None = None,
     project_type: str | None = None,
 ) -> int:
-    with get_connection() as connection:
-        cursor = connection.execute(
+    with get_writer() as connection:
+        (new_id,) = connection.execute(
             """
             INSERT INTO users (email, password_hash, full_name, city, project_type)
             VALUES (?, ?, ?, ?, ?)
+            RETURNING id
             """,
             (email.lower(), password_hash, full_name, city, project_type),
-        )
-        return int(cursor.lastrowid)
+        ).fetchone()
+    return int(new_id)
+
+
+_SQL_USER_BY_EMAIL = """
+    SELECT id, email, password_hash, full_name, city, project_type, created_at
+    FROM users
+    WHERE email = ?
+"""
+
+_SQL_EMAIL_EXISTS = "SELECT EXISTS(SELECT 1 FROM users WHERE email = ?)"
+
+_SQL_UPDATE_PASSWORD_HASH = "UPDATE users SET password_hash = ? WHERE id = ?"
+
+_SQL_USER_BY_ID = "SELECT id, email, full_name, city, project_type, created_at FROM users WHERE id = ?"
 
 
 def get_user_by_email(email: str) -> dict[str, Any] | None:
-    with get_connection() as connection:
-        row = connection.execute(
-            """
-            SELECT id, email, password_hash, full_name, city, project_type, created_at
-            FROM users
-            WHERE email = ?
-            """,
-            (email.lower(),),
-        ).fetchone()
+    with get_reader() as connection:
+        row = connection.execute(_SQL_USER_BY_EMAIL, (email.lower(),)).fetchone()
     return dict(row) if row else None
 
 
+def email_exists(email: str) -> bool:
+    """Check the unique email index without loading the password hash."""
+    with get_reader() as connection:
+        (exists,) = connection.execute(_SQL_EMAIL_EXISTS, (email.lower(),)).fetchone()
+    return bool(exists)
+
+
+def update_password_hash(user_id: int, password_hash: str) -> None:
+    with get_writer() as connection:
+        connection.execute(_SQL_UPDATE_PASSWORD_HASH, (password_hash, user_id))
+
+
 def get_user_by_id(user_id: int) -> dict[str, Any] | None:
-    with get_connection() as connection:
-        row = connection.execute(
-            "SELECT id, email, full_name, city, project_type, created_at FROM users WHERE id = ?",
-            (user_id,),
-        ).fetchone()
+    with get_reader() as connection:
+        row = connection.execute(_SQL_USER_BY_ID, (user_id,)).fetchone()
     return dict(row) if row else None
 
 
+_SQL_CREATE_SESSION = """
+    INSERT INTO sessions (token, user_id)
+    VALUES (?, ?)
+    ON CONFLICT (token) DO UPDATE SET user_id = excluded.user_id, created_at = CURRENT_TIMESTAMP
+    WHERE sessions.user_id <> excluded.user_id
+"""
+
+_SQL_USER_BY_TOKEN = """
+    SELECT users.id, users.email, users.full_name, users.city, users.project_type
+    FROM sessions
+    JOIN users ON users.id = sessions.user_id
+    WHERE sessions.token = ?
+"""
+
+_SQL_REVOKE_SESSION = "DELETE FROM sessions WHERE token = ?"
+
+
 def create_session(token: str, user_id: int) -> None:
-    with get_connection() as connection:
-        connection.execute(
-            """
-            INSERT OR REPLACE INTO sessions (token, user_id)
-            VALUES (?, ?)
-            """,
-            (token, user_id),
-        )
+    with _session_cache_lock:
+        _session_cache.pop(token, None)
+    with get_writer() as connection:
+        connection.execute(_SQL_CREATE_SESSION, (token, user_id))
 
 
 def get_user_by_token(token: str) -> dict[str, Any] | None:
+    """Resolve a session token, serving recent lookups from the session cache."""
     if not token:
         return None
-    with get_connection() as connection:
-        row = connection.execute(
-            """
-            SELECT users.id, users.email, users.full_name, users.city, users.project_type
-            FROM sessions
-            JOIN users ON users.id = sessions.user_id
-            WHERE sessions.token = ?
-            """,
-            (token,),
-        ).fetchone()
-    return dict(row) if row else None
+    now = time.monotonic()
+    with _session_cache_lock:
+        cached = _session_cache.get(token)
+        if cached is not None:
+            if cached[0] > now:
+                _session_cache.move_to_end(token)
+                return dict(cached[1])
+            del _session_cache[token]
+
+    with get_reader() as connection:
+        row = connection.execute(_SQL_USER_BY_TOKEN, (token,)).fetchone()
+    if row is None:
+        return None
+
+    user = dict(row)
+    with _session_cache_lock:
+        _session_cache[token] = (now + SESSION_CACHE_TTL, user)
+        while len(_session_cache) > SESSION_CACHE_SIZE:
+            _session_cache.popitem(last=False)
+    return dict(user)
 
 
 def revoke_session(token: str) -> None:
-    with get_connection() as connection:
-        connection.execute("DELETE FROM sessions WHERE token = ?", (token,))
+    with _session_cache_lock:
+        _session_cache.pop(token, None)
+    with get_writer() as connection:
+        connection.execute(_SQL_REVOKE_SESSION, (token,))
 
 
 def create_user_project(
@@ -484,115 +474,266 @@ def create_user_project(
     viability: float,
     manual_path: str | None = None,
     status: str = "En preparación",
+    *,
+    manual_path_for: Callable[[int], str] | None = None,
 ) -> int:
-    with get_connection() as connection:
-        cursor = connection.execute(
+    """Insert a user project and return its id.
+
+    ``manual_path_for`` derives the manual path from the new id; it is stored
+    in the same transaction as the insert, so creating a project and
+    recording its manual costs a single commit.
+    """
+    with transaction() as connection:
+        (new_id,) = connection.execute(
             """
             INSERT INTO user_projects (user_id, title, form_data, plan_data, viability, manual_path, status)
             VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING id
             """,
             (
                 user_id,
                 title,
-                json.dumps(form_data),
-                json.dumps(plan_data),
+                _dump_json(form_data),
+                _dump_json(plan_data),
                 viability,
                 manual_path,
                 status,
             ),
+        ).fetchone()
+        if manual_path_for is not None:
+            connection.execute(_SQL_SET_MANUAL_PATH, (manual_path_for(new_id), new_id))
+    _checkpoint_if_due()
+    return int(new_id)
+
+
+def create_user_projects_bulk(projects: Iterable[Mapping[str, Any]]) -> list[int]:
+    """Insert many user projects in one transaction and return their ids.
+
+    Each mapping takes the same keys as ``create_user_project``. Rows are
+    written with multi-row ``INSERT ... VALUES`` statements of
+    ``BULK_INSERT_CHUNK`` rows; ids are returned in input order.
+    """
+    rows = [
+        (
+            project["user_id"],
+            project["title"],
+            _dump_json(project["form_data"]),
+            _dump_json(project["plan_data"]),
+            project["viability"],
+            project.get("manual_path"),
+            project.get("status", "En preparación"),
         )
-        return int(cursor.lastrowid)
+        for project in projects
+    ]
+    ids: list[int] = []
+    with transaction() as connection:
+        for start in range(0, len(rows), BULK_INSERT_CHUNK):
+            chunk = rows[start : start + BULK_INSERT_CHUNK]
+            placeholders = ", ".join(["(?, ?, ?, ?, ?, ?, ?)"] * len(chunk))
+            cursor = connection.execute(
+                "INSERT INTO user_projects (user_id, title, form_data, plan_data, viability, manual_path, status) "
+                f"VALUES {placeholders} RETURNING id",
+                [value for row in chunk for value in row],
+            )
+            # RETURNING order is unspecified; rowids are assigned in insert order.
+            ids.extend(sorted(new_id for (new_id,) in cursor.fetchall()))
+    _checkpoint_if_due()
+    return ids
+
+
+_SQL_UPDATE_PROJECT_PROGRESS = """
+    UPDATE user_projects
+    SET progress = COALESCE(?, progress),
+        status = COALESCE(?, status),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+
+_SQL_SET_MANUAL_PATH = "UPDATE user_projects SET manual_path = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
 
 
 def update_project_progress(project_id: int, *, progress: float | None = None, status: str | None = None) -> None:
-    assignments: list[str] = []
-    params: list[Any] = []
-    if progress is not None:
-        assignments.append("progress = ?")
-        params.append(progress)
-    if status is not None:
-        assignments.append("status = ?")
-        params.append(status)
-    if not assignments:
+    if progress is None and status is None:
         return
-    params.append(project_id)
-    with get_connection() as connection:
-        connection.execute(
-            f"UPDATE user_projects SET {', '.join(assignments)}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-            tuple(params),
-        )
+    with get_writer() as connection:
+        connection.execute(_SQL_UPDATE_PROJECT_PROGRESS, (progress, status, project_id))
 
 
 def set_project_manual_path(project_id: int, manual_path: str) -> None:
-    with get_connection() as connection:
-        connection.execute(
-            "UPDATE user_projects SET manual_path = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-            (manual_path, project_id),
-        )
-
-
-def list_user_projects(user_id: int) -> list[dict[str, Any]]:
-    with get_connection() as connection:
-        cursor = connection.execute(
-            """
-            SELECT id, title, form_data, plan_data, viability, manual_path, status, progress, created_at, updated_at
-            FROM user_projects
-            WHERE user_id = ?
-            ORDER BY created_at DESC
-            """,
-            (user_id,),
-        )
+    with get_writer() as connection:
+        connection.execute(_SQL_SET_MANUAL_PATH, (manual_path, project_id))
+
+
+_SQL_LIST_USER_PROJECTS = """
+    SELECT id, title, form_data, plan_data, viability, manual_path, status, progress, created_at, updated_at
+    FROM user_projects
+    WHERE user_id = ?
+    ORDER BY created_at DESC, id DESC
+"""
+
+_SQL_LIST_USER_PROJECT_SUMMARIES = """
+    SELECT id, title, viability, manual_path, status, progress, created_at, updated_at
+    FROM user_projects
+    WHERE user_id = ?
+    ORDER BY created_at DESC, id DESC
+"""
+
+
+def list_user_projects(user_id: int, *, include_payload: bool = True) -> list[dict[str, Any]]:
+    """Return the user's projects, newest first.
+
+    With ``include_payload=False`` the ``form_data``/``plan_data`` blobs are
+    neither read nor decoded, for listings that only show summaries.
+    """
+    with get_reader() as connection:
+        if not include_payload:
+            return [dict(row) for row in connection.execute(_SQL_LIST_USER_PROJECT_SUMMARIES, (user_id,))]
+        cursor = connection.execute(_SQL_LIST_USER_PROJECTS, (user_id,))
         projects: list[dict[str, Any]] = []
         for row in cursor.fetchall():
             project = dict(row)
-            project["form_data"] = json.loads(project["form_data"])
-            project["plan_data"] = json.loads(project["plan_data"])
+            project["form_data"] = _load_json(project["form_data"])
+            project["plan_data"] = _load_json(project["plan_data"])
             projects.append(project)
         return projects
 
 
+_SQL_USER_PROJECT = """
+    SELECT id, title, form_data, plan_data, viability, manual_path, status, progress, created_at, updated_at
+    FROM user_projects
+    WHERE id = ? AND user_id = ?
+"""
+
+
 def get_user_project(project_id: int, user_id: int) -> dict[str, Any] | None:
-    with get_connection() as connection:
-        row = connection.execute(
-            """
-            SELECT id, title, form_data, plan_data, viability, manual_path, status, progress, created_at, updated_at
-            FROM user_projects
-            WHERE id = ? AND user_id = ?
-            """,
-            (project_id, user_id),
-        ).fetchone()
+    with get_reader() as connection:
+        row = connection.execute(_SQL_USER_PROJECT, (project_id, user_id)).fetchone()
     if row is None:
         return None
     project = dict(row)
-    project["form_data"] = json.loads(project["form_data"])
-    project["plan_data"] = json.loads(project["plan_data"])
+    project["form_data"] = _load_json(project["form_data"])
+    project["plan_data"] = _load_json(project["plan_data"])
     return project
 
 
-def record_video_watch(user_id: int, video_id: int) -> None:
-    with get_connection() as connection:
-        connection.execute(
-            """
-            INSERT OR IGNORE INTO video_watch_history (user_id, video_id)
-            VALUES (?, ?)
-            """,
-            (user_id, video_id),
-        )
+_SQL_RECORD_VIDEO_WATCH = """
+    INSERT OR IGNORE INTO video_watch_history (user_id, video_id)
+    SELECT ?, id FROM videos WHERE id = ?
+"""
 
+_SQL_WATCHED_VIDEO_IDS = "SELECT video_id FROM video_watch_history WHERE user_id = ?"
 
-def get_watched_video_ids(user_id: int) -> set[int]:
-    with get_connection() as connection:
-        cursor = connection.execute(
-            "SELECT video_id FROM video_watch_history WHERE user_id = ?",
-            (user_id,),
-        )
-        return {row["video_id"] for row in cursor.fetchall()}
+_SQL_WATCHED_VIDEO_COUNT = "SELECT COUNT(*) FROM video_watch_history WHERE user_id = ?"
+
+_SQL_TOTAL_VIDEOS = "SELECT COUNT(*) FROM videos"
+
+
+def record_video_watch(user_id: int, video_id: int) -> None:
+    """Queue a watch event; it is persisted by ``flush_pending_watches``.
+
+    The buffer is flushed when it fills up, before watch history is read and
+    at the end of every API request. Unknown video ids are dropped.
+    """
+    with _pending_watches_lock:
+        _pending_watches.append((user_id, video_id))
+        full = len(_pending_watches) >= WATCH_BUFFER_SIZE
+    if full:
+        try:
+            flush_pending_watches()
+        except sqlite3.Error:
+            # The event is queued either way; the next flush retries the batch.
+            _logger.warning("Could not flush buffered watch events", exc_info=True)
+
+
+def flush_pending_watches() -> None:
+    """Write every buffered watch event in a single transaction.
+
+    The buffer is swapped out first so new events can be queued while the
+    batch is written. A failed batch is put back for the next flush and is
+    dropped after ``WATCH_FLUSH_RETRIES`` consecutive failures.
+    """
+    global _watch_flush_failures
+    # Serialises flushes so a reader that flushes first sees every earlier event.
+    with _watch_flush_lock:
+        with _pending_watches_lock:
+            batch, _pending_watches[:] = list(_pending_watches), []
+        if not batch:
+            return
+        try:
+            with transaction() as connection:
+                connection.executemany(_SQL_RECORD_VIDEO_WATCH, batch)
+        except sqlite3.Error:
+            _watch_flush_failures += 1
+            if _watch_flush_failures > WATCH_FLUSH_RETRIES:
+                _watch_flush_failures = 0
+                _logger.exception("Dropping %d watch events after repeated write failures", len(batch))
+                return
+            with _pending_watches_lock:
+                _pending_watches[:0] = batch
+            raise
+        _watch_flush_failures = 0
+
+
+atexit.register(flush_pending_watches)
+
+
+def get_watched_video_ids(user_id: int) -> frozenset[int]:
+    """Return the user's watched ids; the lookup is served by the UNIQUE (user_id, video_id) index."""
+    flush_pending_watches()
+    with get_reader() as connection:
+        cursor = connection.cursor()
+        cursor.row_factory = None
+        cursor.execute(_SQL_WATCHED_VIDEO_IDS, (user_id,))
+        return frozenset(video_id for (video_id,) in cursor)
+
+
+def get_video_progress(user_id: int) -> tuple[int, int]:
+    """Return ``(watched, total)`` video counts without materializing the ids."""
+    flush_pending_watches()
+    with get_reader() as connection:
+        (watched,) = connection.execute(_SQL_WATCHED_VIDEO_COUNT, (user_id,)).fetchone()
+    return int(watched), total_videos()
 
 
 def total_videos() -> int:
-    with get_connection() as connection:
-        (count,) = connection.execute("SELECT COUNT(*) FROM videos").fetchone()
-    return int(count)
+    """Return the catalog size; it only changes when the catalog is reseeded."""
+    global _total_videos
+    now = time.monotonic()
+    cached = _total_videos
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    with get_reader() as connection:
+        (total,) = connection.execute(_SQL_TOTAL_VIDEOS).fetchone()
+    _total_videos = (now + VIDEO_COUNT_TTL, int(total))
+    return int(total)
+
+
+def build_query_variants(base: str, filters: Sequence[str], order_by: str) -> dict[tuple[bool, ...], str]:
+    """Build every WHERE combination of ``base`` up front, keyed by active filter.
+
+    Keys hold one flag per entry of ``filters``. Looking a query up instead of
+    assembling it per call keeps each filter shape on a single cached statement.
+    """
+    variants = {}
+    for active in product((False, True), repeat=len(filters)):
+        clauses = [clause for clause, enabled in zip(filters, active) if enabled]
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        variants[active] = f"{base}{where} ORDER BY {order_by}"
+    return variants
+
+
+_LIST_VIDEOS_QUERIES = build_query_variants(
+    "SELECT id, title, category, youtube_id, level, stage, description, manual_step, tags FROM videos",
+    (
+        "level = ? COLLATE NOCASE",
+        "category = ? COLLATE NOCASE",
+        "stage = ? COLLATE NOCASE",
+        # LIKE already ignores ASCII case, exactly like the old LOWER() form.
+        "title LIKE ?",
+    ),
+    "level_order, title",
+)
 
 
 def list_videos(
@@ -602,29 +743,13 @@ def list_videos(
     stage: str | None = None,
     search: str | None = None,
 ) -> list[dict[str, Any]]:
-    query = "SELECT id, title, category, youtube_id, level, stage, description, manual_step, tags FROM videos"
-    clauses: list[str] = []
-    params: list[Any] = []
-    if level:
-        clauses.append("LOWER(level) = LOWER(?)")
-        params.append(level)
-    if category:
-        clauses.append("LOWER(category) = LOWER(?)")
-        params.append(category)
-    if stage:
-        clauses.append("LOWER(stage) = LOWER(?)")
-        params.append(stage)
-    if search:
-        clauses.append("LOWER(title) LIKE ?")
-        params.append(f"%{search.lower()}%")
-    if clauses:
-        query += " WHERE " + " AND ".join(clauses)
-    query += " ORDER BY CASE LOWER(level) WHEN 'principiante' THEN 0 WHEN 'intermedio' THEN 1 WHEN 'avanzado' THEN 2 ELSE 3 END, stage, title"
-    return fetch_rows(query, params)
+    pattern = f"%{search}%" if search else None
+    params = [value for value in (level, category, stage, pattern) if value]
+    return fetch_rows(_LIST_VIDEOS_QUERIES[bool(level), bool(category), bool(stage), bool(search)], params)
 
 
 def record_manual_download(user_id: int, project_id: int) -> None:
-    with get_connection() as connection:
+    with get_writer() as connection:
         connection.execute(
             """
             INSERT INTO manual_downloads (user_id, project_id)
@@ -634,82 +759,95 @@ def record_manual_download(user_id: int, project_id: int) -> None:
         )
 
 
+_SQL_SAVE_PROJECT = """
+    INSERT INTO projects (form_data, results, viability)
+    VALUES (?, ?, ?)
+    RETURNING id
+"""
+
+_SQL_GET_PROJECT = "SELECT id, form_data, results, viability, created_at FROM projects WHERE id = ?"
+
+
 def save_project(
     form_data: dict[str, Any],
     results: dict[str, Any],
     viability: float,
 ) -> int:
-    with get_connection() as connection:
-        cursor = connection.execute(
-            """
-            INSERT INTO projects (form_data, results, viability)
-            VALUES (?, ?, ?)
-            """,
-            (json.dumps(form_data), json.dumps(results), viability),
-        )
-        return int(cursor.lastrowid)
+    with get_writer() as connection:
+        (new_id,) = connection.execute(
+            _SQL_SAVE_PROJECT,
+            (_dump_json(form_data), _dump_json(results), viability),
+        ).fetchone()
+    _checkpoint_if_due()
+    return int(new_id)
 
 
 def get_project(project_id: int) -> dict[str, Any] | None:
-    with get_connection() as connection:
-        row = connection.execute(
-            "SELECT id, form_data, results, viability, created_at FROM projects WHERE id = ?",
-            (project_id,),
-        ).fetchone()
+    with get_reader() as connection:
+        row = connection.execute(_SQL_GET_PROJECT, (project_id,)).fetchone()
 
     if row is None:
         return None
 
     return {
         "id": row["id"],
-        "form_data": json.loads(row["form_data"]),
-        "results": json.loads(row["results"]),
+        "form_data": _load_json(row["form_data"]),
+        "results": _load_json(row["results"]),
         "viability": row["viability"],
         "created_at": row["created_at"],
     }
 
 
-def list_providers(
+_LIST_PROVIDERS_QUERIES = build_query_variants(
+    "SELECT id, name, provider_type, specialty, city, locality, price_min, price_max, rating, description, contact, portfolio_url, experience_years "
+    "FROM providers",
+    (
+        "city = ? COLLATE NOCASE",
+        "provider_type = ? COLLATE NOCASE",
+        "(price_max IS NULL OR price_max >= ?)",
+        "(price_min IS NULL OR price_min <= ?)",
+    ),
+    "rating DESC, price_min",
+)
+
+
+# The ``_LIST_PROVIDERS_QUERIES`` variants, aggregated by SQLite into the JSON
+# array the providers endpoint returns.
+_LIST_PROVIDERS_JSON_QUERIES = {
+    active: (
+        "SELECT json_group_array(json_object("
+        "'id', id, 'name', name, 'type', provider_type, 'specialty', specialty, 'city', city, "
+        "'locality', locality, 'price_min', price_min, 'price_max', price_max, 'rating', rating, "
+        "'description', description, 'contact', contact, 'portfolio_url', portfolio_url, "
+        f"'experience_years', experience_years)) FROM ({query})"
+    )
+    for active, query in _LIST_PROVIDERS_QUERIES.items()
+}
+
+
+def list_providers_json(
     *,
     city: str | None = None,
     provider_type: str | None = None,
     price_min: float | None = None,
     price_max: float | None = None,
-) -> list[dict[str, Any]]:
-    query = (
-        "SELECT id, name, provider_type, specialty, city, locality, price_min, price_max, rating, description, contact, portfolio_url, experience_years "
-        "FROM providers"
-    )
-    clauses: list[str] = []
-    params: list[Any] = []
-    if city:
-        clauses.append("LOWER(city) = LOWER(?)")
-        params.append(city)
-    if provider_type:
-        clauses.append("LOWER(provider_type) = LOWER(?)")
-        params.append(provider_type)
-    if price_min is not None:
-        clauses.append("(price_max IS NULL OR price_max >= ?)")
-        params.append(price_min)
-    if price_max is not None:
-        clauses.append("(price_min IS NULL OR price_min <= ?)")
-        params.append(price_max)
-    if clauses:
-        query += " WHERE " + " AND ".join(clauses)
-    query += " ORDER BY rating DESC, price_min"
-    return fetch_rows(query, params)
+) -> str:
+    """Return the matching providers, best rated first, as an encoded JSON array."""
+    filters = (city or None, provider_type or None, price_min, price_max)
+    params = [value for value in filters if value is not None]
+    return fetch_json_array(_LIST_PROVIDERS_JSON_QUERIES[tuple(value is not None for value in filters)], params)
+
+
+_SQL_GET_PROVIDER = """
+    SELECT id, name, provider_type, specialty, city, locality, price_min, price_max, rating, description, contact, portfolio_url, experience_years
+    FROM providers
+    WHERE id = ?
+"""
 
 
 def get_provider(provider_id: int) -> dict[str, Any] | None:
-    with get_connection() as connection:
-        row = connection.execute(
-            """
-            SELECT id, name, provider_type, specialty, city, locality, price_min, price_max, rating, description, contact, portfolio_url, experience_years
-            FROM providers
-            WHERE id = ?
-            """,
-            (provider_id,),
-        ).fetchone()
+    with get_reader() as connection:
+        row = connection.execute(_SQL_GET_PROVIDER, (provider_id,)).fetchone()
     return dict(row) if row else None
 
 
@@ -720,59 +858,169 @@ def create_hire_request(
     provider_id: int,
     message: str | None = None,
 ) -> int:
-    with get_connection() as connection:
-        cursor = connection.execute(
+    with get_writer() as connection:
+        (new_id,) = connection.execute(
             """
             INSERT INTO project_hires (user_id, project_id, provider_id, message)
             VALUES (?, ?, ?, ?)
+            RETURNING id
             """,
             (user_id, project_id, provider_id, message),
-        )
-        return int(cursor.lastrowid)
+        ).fetchone()
+    return int(new_id)
+
+
+_SQL_LIST_HIRE_REQUESTS = """
+    SELECT project_hires.id, project_hires.project_id, project_hires.status, project_hires.created_at,
+           providers.name AS provider_name, providers.provider_type, providers.city, providers.contact
+    FROM project_hires
+    JOIN providers ON providers.id = project_hires.provider_id
+    WHERE project_hires.user_id = ?
+    ORDER BY project_hires.created_at DESC
+"""
 
 
 def list_hire_requests(user_id: int) -> list[dict[str, Any]]:
-    return fetch_rows(
-        """
-        SELECT project_hires.id, project_hires.project_id, project_hires.status, project_hires.created_at,
-               providers.name AS provider_name, providers.provider_type, providers.city, providers.contact
-        FROM project_hires
-        JOIN providers ON providers.id = project_hires.provider_id
-        WHERE project_hires.user_id = ?
-        ORDER BY project_hires.created_at DESC
-        """,
-        (user_id,),
-    )
+    return fetch_rows(_SQL_LIST_HIRE_REQUESTS, (user_id,))
 
 
-def fetch_rows(query: str, params: Iterable[Any] | None = None) -> list[dict[str, Any]]:
-    with get_connection() as connection:
-        cursor = connection.execute(query, tuple(params or []))
-        return [dict(row) for row in cursor.fetchall()]
+_SQL_PROJECT_FORM_DATA = "SELECT form_data FROM user_projects WHERE id = ?"
 
 
-def _has_rows(connection: sqlite3.Connection, table: str) -> bool:
-    cursor = connection.execute(f"SELECT 1 FROM {table} LIMIT 1")
-    return cursor.fetchone() is not None
+def get_dashboard_bundle(user_id: int) -> dict[str, Any]:
+    """Load everything the dashboard shows with one connection and one snapshot.
 
+    Returns ``projects`` (summaries), ``latest_form_data`` (``None`` without
+    projects), ``watched_ids``, ``total_videos`` and ``hire_requests``.
+    """
+    flush_pending_watches()
+    with get_reader() as connection:
+        connection.execute("BEGIN")
+        try:
+            projects = [dict(row) for row in connection.execute(_SQL_LIST_USER_PROJECT_SUMMARIES, (user_id,))]
+            latest_form_data = None
+            if projects:
+                (raw,) = connection.execute(_SQL_PROJECT_FORM_DATA, (projects[0]["id"],)).fetchone()
+                latest_form_data = _load_json(raw)
+            watched_ids = frozenset(
+                video_id for (video_id,) in connection.execute(_SQL_WATCHED_VIDEO_IDS, (user_id,))
+            )
+            hire_requests = [dict(row) for row in connection.execute(_SQL_LIST_HIRE_REQUESTS, (user_id,))]
+        finally:
+            connection.execute("COMMIT")
+    return {
+        "projects": projects,
+        "latest_form_data": latest_form_data,
+        "watched_ids": watched_ids,
+        "total_videos": total_videos(),
+        "hire_requests": hire_requests,
+    }
 
-def _seed_video_catalog(connection: sqlite3.Connection) -> None:
-    """Ensure the bundled video catalog is available in the database."""
 
-    cursor = connection.execute("SELECT youtube_id FROM videos")
-    existing_ids = {row["youtube_id"] for row in cursor.fetchall()}
-    catalog_ids = {item["youtube_id"] for item in VIDEO_CATALOG}
+def fetch_rows(query: str, params: Sequence[Any] = ()) -> list[dict[str, Any]]:
+    """Run a read-only query and return its rows as plain dicts.
 
-    if existing_ids == catalog_ids and len(existing_ids) == len(VIDEO_CATALOG):
-        return
+    Rows are fetched as raw tuples and zipped with the column names once,
+    skipping the intermediate ``sqlite3.Row`` objects. The result is
+    materialized before the pooled connection is handed back, so callers can
+    hold on to it freely. With debug logging enabled, the query plan of
+    every call is logged so full-table scans show up during development.
+    """
+    with get_reader() as connection:
+        if _logger.isEnabledFor(logging.DEBUG):
+            plan = connection.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+            _logger.debug("Query plan for %s: %s", " ".join(query.split()), [step[3] for step in plan])
+        cursor = connection.cursor()
+        cursor.row_factory = None
+        cursor.execute(query, params)
+        columns = tuple(column[0] for column in cursor.description)
+        return [dict(zip(columns, row)) for row in cursor]
+
+
+def fetch_json_array(query: str, params: Sequence[Any] = ()) -> str:
+    """Run a single-value ``json_group_array(...)`` query and return its JSON text.
+
+    The rows never become Python objects; the text can be embedded in a
+    response body as is.
+    """
+    with get_reader() as connection:
+        (encoded,) = connection.execute(query, params).fetchone()
+    return encoded or "[]"
 
-    connection.execute("DELETE FROM video_watch_history")
-    connection.execute("DELETE FROM videos")
-    connection.executemany(
-        """
-        INSERT INTO videos (title, category, youtube_id, level, stage, description, manual_step, tags)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+
+# Fingerprint of the bundled catalog. The stdlib encoder is used on purpose so
+# the value does not depend on whether orjson is installed.
+_CATALOG_FINGERPRINT = hashlib.blake2b(
+    json.dumps(VIDEO_CATALOG, sort_keys=True, ensure_ascii=False).encode("utf-8"),
+    digest_size=16,
+).hexdigest()
+
+_SQL_CATALOG_FINGERPRINT = "SELECT value FROM meta WHERE key = 'video_catalog'"
+
+_SQL_SET_CATALOG_FINGERPRINT = """
+    INSERT INTO meta (key, value) VALUES ('video_catalog', ?)
+    ON CONFLICT (key) DO UPDATE SET value = excluded.value
+"""
+
+
+def _seed_video_catalog(connection: sqlite3.Connection) -> None:
+    """Ensure the bundled video catalog is available in the database.
+
+    The fingerprint stored in ``meta`` short-circuits the check with a single
+    primary-key lookup; the stored rows are only synchronised when it is
+    missing or the bundled catalog changed.
+    """
+    row = connection.execute(_SQL_CATALOG_FINGERPRINT).fetchone()
+    if row is not None and row["value"] == _CATALOG_FINGERPRINT:
+        return
+    _sync_video_catalog(connection)
+    connection.execute(_SQL_SET_CATALOG_FINGERPRINT, (_CATALOG_FINGERPRINT,))
+
+
+def reload_video_catalog() -> None:
+    """Synchronise the stored videos with the bundled catalog in one transaction."""
+    with bulk_load("video_watch_history") as connection:
+        _sync_video_catalog(connection)
+        connection.execute(_SQL_SET_CATALOG_FINGERPRINT, (_CATALOG_FINGERPRINT,))
+
+
+_VIDEO_COLUMNS = ("title", "category", "youtube_id", "level", "stage", "description", "manual_step", "tags")
+
+# Only rows whose content differs are rewritten; unchanged videos keep their
+# id and their watch history.
+_VIDEO_UPSERT = """
+    ON CONFLICT (youtube_id) DO UPDATE SET
+        title = excluded.title,
+        category = excluded.category,
+        level = excluded.level,
+        stage = excluded.stage,
+        description = excluded.description,
+        manual_step = excluded.manual_step,
+        tags = excluded.tags
+    WHERE (videos.title, videos.category, videos.level, videos.stage,
+           videos.description, videos.manual_step, videos.tags)
+       IS NOT (excluded.title, excluded.category, excluded.level, excluded.stage,
+               excluded.description, excluded.manual_step, excluded.tags)
+"""
+
+
+def _sync_video_catalog(connection: sqlite3.Connection) -> None:
+    """Upsert the bundled catalog and drop videos that are no longer in it.
+
+    Watch history is only removed for the dropped videos. Callers run inside
+    ``bulk_load``, where foreign keys are off, so that cleanup is explicit.
+    """
+    global _total_videos
+
+    _total_videos = None
+    catalog_ids = [video["youtube_id"] for video in VIDEO_CATALOG]
+    stale = f"SELECT id FROM videos WHERE youtube_id NOT IN ({', '.join('?' * len(catalog_ids))})"
+    connection.execute(f"DELETE FROM video_watch_history WHERE video_id IN ({stale})", catalog_ids)
+    connection.execute(f"DELETE FROM videos WHERE id IN ({stale})", catalog_ids)
+    _bulk_insert(
+        connection,
+        "videos",
+        _VIDEO_COLUMNS,
         [
             (
                 video["title"],
@@ -786,4 +1034,5 @@ def _seed_video_catalog(connection: sqlite3.Connection) -> None:
             )
             for video in VIDEO_CATALOG
         ],
+        on_conflict=_VIDEO_UPSERT,
     )
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from typing import Any, Mapping
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class User:
     id: int
     email: str
@@ -18,9 +18,9 @@ class User:
         return cls(
             id=int(row["id"]),
             email=str(row["email"]),
-            full_name=row.get("full_name"),
-            city=row.get("city"),
-            project_type=row.get("project_type"),
+            full_name=row["full_name"],
+            city=row["city"],
+            project_type=row["project_type"],
         )
 
 
@@ -47,107 +47,46 @@ class Project:
         )
 
 
-@dataclass(slots=True)
-class Video:
-    id: int
-    title: str
-    url: str
-    youtube_id: str
-    level: str
-    category: str
-    stage: str | None
-    manual_step: str | None
-    description: str | None
-    embed_url: str
-    thumbnail_url: str | None
-
-    @classmethod
-    def from_row(cls, row: Mapping[str, Any]) -> "Video":
-        youtube_id = str(row["youtube_id"])
-        return cls(
-            id=int(row["id"]),
-            title=str(row["title"]),
-            url=build_youtube_watch_url(youtube_id),
-            youtube_id=youtube_id,
-            level=str(row.get("level", "principiante")),
-            category=str(row.get("category", "")),
-            stage=row.get("stage"),
-            manual_step=row.get("manual_step"),
-            description=row.get("description"),
-            embed_url=build_youtube_embed_url(youtube_id),
-            thumbnail_url=build_youtube_thumbnail_url(youtube_id),
+def video_dict_from_row(row: Mapping[str, Any]) -> dict[str, Any]:
+    """Project a ``videos`` row to its API payload."""
+    youtube_id = row["youtube_id"]
+    url, embed_url, thumbnail_url = youtube_urls(youtube_id)
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "url": url,
+        "watch_url": url,
+        "embed_url": embed_url,
+        "youtube_id": youtube_id,
+        "level": row["level"],
+        "category": row["category"],
+        "stage": row["stage"],
+        "manual_step": row["manual_step"],
+        "description": row["description"],
+        "thumbnail": thumbnail_url,
+    }
+
+
+YOUTUBE_PLAYLIST_PREFIX = "videoseries?list="
+_PLAYLIST_ID_START = len(YOUTUBE_PLAYLIST_PREFIX)
+_WATCH_URL = "https://www.youtube.com/watch?v="
+_PLAYLIST_URL = "https://www.youtube.com/playlist?list="
+_EMBED_URL = "https://www.youtube.com/embed/"
+_EMBED_PARAMS = "rel=0&modestbranding=1"
+_THUMBNAIL_URL = "https://img.youtube.com/vi/{}/hqdefault.jpg"
+
+
+def youtube_urls(youtube_id: str) -> tuple[str, str, str | None]:
+    """Return ``(watch_url, embed_url, thumbnail_url)`` with a single prefix check."""
+
+    if youtube_id.startswith(YOUTUBE_PLAYLIST_PREFIX):
+        return (
+            _PLAYLIST_URL + youtube_id[_PLAYLIST_ID_START:],
+            f"{_EMBED_URL}{youtube_id}&{_EMBED_PARAMS}",
+            None,
         )
-
-
-@dataclass(slots=True)
-class Provider:
-    id: int
-    name: str
-    provider_type: str
-    specialty: str | None
-    city: str
-    locality: str | None
-    price_min: float | None
-    price_max: float | None
-    rating: float | None
-    description: str | None
-    contact: str | None
-    portfolio_url: str | None
-    experience_years: int | None
-
-    @classmethod
-    def from_row(cls, row: Mapping[str, Any]) -> "Provider":
-        return cls(
-            id=int(row["id"]),
-            name=str(row["name"]),
-            provider_type=str(row.get("provider_type", "")),
-            specialty=row.get("specialty"),
-            city=str(row.get("city", "")),
-            locality=row.get("locality"),
-            price_min=_to_float(row.get("price_min")),
-            price_max=_to_float(row.get("price_max")),
-            rating=_to_float(row.get("rating")),
-            description=row.get("description"),
-            contact=row.get("contact"),
-            portfolio_url=row.get("portfolio_url"),
-            experience_years=_to_int(row.get("experience_years")),
-        )
-
-
-def _to_float(value: Any) -> float | None:
-    try:
-        return None if value is None else float(value)
-    except (TypeError, ValueError):
-        return None
-
-
-def _to_int(value: Any) -> int | None:
-    try:
-        return None if value is None else int(value)
-    except (TypeError, ValueError):
-        return None
-
-
-def build_youtube_watch_url(youtube_id: str) -> str:
-    """Return a YouTube URL that works for videos and playlists."""
-
-    if youtube_id.startswith("videoseries?list="):
-        list_id = youtube_id.split("list=", 1)[1]
-        return f"https://www.youtube.com/playlist?list={list_id}"
-    return f"https://www.youtube.com/watch?v={youtube_id}"
-
-
-def build_youtube_embed_url(youtube_id: str) -> str:
-    """Return an embeddable URL that keeps branding to a minimum."""
-
-    base = f"https://www.youtube.com/embed/{youtube_id}"
-    separator = "&" if "?" in youtube_id else "?"
-    return f"{base}{separator}rel=0&modestbranding=1"
-
-
-def build_youtube_thumbnail_url(youtube_id: str) -> str | None:
-    """Return a thumbnail URL when available for the given YouTube resource."""
-
-    if youtube_id.startswith("videoseries?list="):
-        return None
-    return f"https://img.youtube.com/vi/{youtube_id}/hqdefault.jpg"
+    return (
+        _WATCH_URL + youtube_id,
+        f"{_EMBED_URL}{youtube_id}?{_EMBED_PARAMS}",
+        _THUMBNAIL_URL.format(youtube_id),
+    )
@@ -0,0 +1,108 @@
+"""Password hashing with the fastest native backend that is installed.
+
+argon2-cffi is preferred, then bcrypt, then werkzeug's built-in hashes.
+Verification dispatches on the stored hash's prefix, so accounts created
+under any backend keep working and are upgraded on their next login.
+"""
+from __future__ import annotations
+
+import secrets
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+try:  # argon2-cffi is optional.
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # pragma: no cover - depends on the environment
+    PasswordHasher = None
+
+try:  # bcrypt is optional.
+    import bcrypt
+except ImportError:  # pragma: no cover - depends on the environment
+    bcrypt = None
+
+ARGON2_TIME_COST = 2
+ARGON2_MEMORY_COST = 64 * 1024  # KiB
+ARGON2_PARALLELISM = 1
+BCRYPT_ROUNDS = 12
+
+_ARGON2_PREFIX = "$argon2"
+_BCRYPT_PREFIX = "$2"
+# bcrypt only reads the first 72 bytes (and bcrypt >= 5 rejects longer input).
+_BCRYPT_MAX_BYTES = 72
+
+_argon2 = (
+    PasswordHasher(
+        time_cost=ARGON2_TIME_COST,
+        memory_cost=ARGON2_MEMORY_COST,
+        parallelism=ARGON2_PARALLELISM,
+    )
+    if PasswordHasher is not None
+    else None
+)
+
+
+def hash_password(password: str) -> str:
+    if _argon2 is not None:
+        return _argon2.hash(password)
+    secret = password.encode("utf-8")
+    # Passwords bcrypt cannot take whole keep werkzeug's scheme.
+    if _bcrypt_accepts(secret):
+        return bcrypt.hashpw(secret, bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("ascii")
+    return generate_password_hash(password)
+
+
+def check_password(password_hash: str | None, password: str) -> bool:
+    """Verify ``password``; a missing hash (unknown user) always fails.
+
+    The unknown-user case still verifies against a dummy hash so that it
+    costs the same as a wrong password and cannot be told apart by timing.
+    """
+    if password_hash is None:
+        # Long passwords are checked against a hash in the scheme they would get
+        # (werkzeug's when bcrypt is in use), never skipped by the bcrypt length guard.
+        long_password = len(password.encode("utf-8")) > _BCRYPT_MAX_BYTES
+        _verify(_DUMMY_LONG_HASH if long_password else _DUMMY_HASH, password)
+        return False
+    return _verify(password_hash, password)
+
+
+def _verify(password_hash: str, password: str) -> bool:
+    if password_hash.startswith(_ARGON2_PREFIX):
+        if _argon2 is None:
+            return False
+        try:
+            return _argon2.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    if password_hash.startswith(_BCRYPT_PREFIX):
+        secret = password.encode("utf-8")
+        if not _bcrypt_accepts(secret):
+            return False
+        try:
+            return bcrypt.checkpw(secret, password_hash.encode("ascii"))
+        except ValueError:  # malformed stored hash
+            return False
+    return check_password_hash(password_hash, password)
+
+
+def needs_rehash(password_hash: str, password: str) -> bool:
+    """Return True when ``hash_password(password)`` would use a better scheme.
+
+    ``password`` is the plaintext that was just verified; it is needed because
+    passwords too long for bcrypt deliberately stay on werkzeug's scheme.
+    """
+    if _argon2 is not None:
+        return not password_hash.startswith(_ARGON2_PREFIX) or _argon2.check_needs_rehash(password_hash)
+    if password_hash.startswith((_ARGON2_PREFIX, _BCRYPT_PREFIX)):
+        return False
+    return _bcrypt_accepts(password.encode("utf-8"))
+
+
+def _bcrypt_accepts(secret: bytes) -> bool:
+    return bcrypt is not None and len(secret) <= _BCRYPT_MAX_BYTES
+
+
+# Hashed with the preferred scheme so verifying it costs the same as a real account.
+_DUMMY_HASH = hash_password(secrets.token_urlsafe(16))
+_DUMMY_LONG_HASH = hash_password(secrets.token_urlsafe(_BCRYPT_MAX_BYTES))
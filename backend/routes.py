@@ -1,17 +1,21 @@
 """REST API routes for ConstruyeSeguro 2.0."""
 from __future__ import annotations
 
+import hashlib
+import json
+import re
 import secrets
+import time
 from functools import wraps
 from http import HTTPStatus
+from itertools import groupby
 from pathlib import Path
 from typing import Any
 
 from flask import Blueprint, Response, current_app, g, jsonify, make_response, request, send_file
-from werkzeug.security import check_password_hash, generate_password_hash
 
-from . import database
-from .models import Provider, User, Video
+from . import database, passwords
+from .models import User, video_dict_from_row
 from .services import financing, manual_builder, plan_generator, youtube_service
 from .validation import validate_project_payload
 
@@ -19,16 +23,31 @@ api_bp = Blueprint("api", __name__)
 
 SESSION_COOKIE_NAME = "cs_session"
 SESSION_COOKIE_MAX_AGE = 60 * 60 * 24 * 30  # 30 days
+SESSION_TOKEN_PREFIX = "cs_"
+SESSION_TOKEN_BYTES = 32
+# token_urlsafe(32) yields 43 characters.
+SESSION_TOKEN_LENGTH = len(SESSION_TOKEN_PREFIX) + 43
+MANUAL_PDF_MAX_AGE = 60 * 60  # 1 hour; the ETag covers regenerated files
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
 
 
 # ---------------------------------------------------------------------------
 # Authentication helpers
 # ---------------------------------------------------------------------------
+def _new_session_token() -> str:
+    return SESSION_TOKEN_PREFIX + secrets.token_urlsafe(SESSION_TOKEN_BYTES)
+
+
 def _extract_token() -> str:
     header = request.headers.get("Authorization", "")
     if header.lower().startswith("bearer "):
-        return header.split(" ", 1)[1]
-    return request.cookies.get(SESSION_COOKIE_NAME, "")
+        token = header.split(" ", 1)[1]
+    else:
+        token = request.cookies.get(SESSION_COOKIE_NAME, "")
+    # Anything that cannot be one of our tokens is rejected without a lookup.
+    if len(token) != SESSION_TOKEN_LENGTH or not token.startswith(SESSION_TOKEN_PREFIX):
+        return ""
+    return token
 
 
 def _set_session_cookie(response: Response, token: str) -> None:
@@ -88,7 +107,7 @@ def register() -> Response:
     city = (payload.get("city") or "").strip() or None
     project_type = (payload.get("project_type") or "").strip() or None
 
-    if not email or "@" not in email:
+    if not EMAIL_PATTERN.fullmatch(email):
         return (
             jsonify({"success": False, "error": "Correo electrónico inválido"}),
             HTTPStatus.BAD_REQUEST,
@@ -103,13 +122,13 @@ def register() -> Response:
             ),
             HTTPStatus.BAD_REQUEST,
         )
-    if database.get_user_by_email(email):
+    if database.email_exists(email):
         return (
             jsonify({"success": False, "error": "Ya existe una cuenta con ese correo"}),
             HTTPStatus.CONFLICT,
         )
 
-    password_hash = generate_password_hash(password)
+    password_hash = passwords.hash_password(password)
     user_id = database.create_user(
         email,
         password_hash,
@@ -117,7 +136,7 @@ def register() -> Response:
         city=city,
         project_type=project_type,
     )
-    token = secrets.token_urlsafe(32)
+    token = _new_session_token()
     database.create_session(token, user_id)
 
     response = make_response(
@@ -149,13 +168,16 @@ def login() -> Response:
     password = payload.get("password") or ""
 
     user = database.get_user_by_email(email)
-    if not user or not check_password_hash(user["password_hash"], password):
+    # Unknown emails still pay for a hash check so they cannot be enumerated by timing.
+    if not passwords.check_password(user["password_hash"] if user else None, password):
         return (
             jsonify({"success": False, "error": "Credenciales inválidas"}),
             HTTPStatus.UNAUTHORIZED,
         )
+    if passwords.needs_rehash(user["password_hash"], password):
+        database.update_password_hash(int(user["id"]), passwords.hash_password(password))
 
-    token = secrets.token_urlsafe(32)
+    token = _new_session_token()
     database.create_session(token, int(user["id"]))
 
     response = make_response(
@@ -192,35 +214,52 @@ def logout() -> Response:
 # ---------------------------------------------------------------------------
 # Project and plan routes
 # ---------------------------------------------------------------------------
+def _manual_path(storage_dir: Path, user_id: int, project_id: int) -> Path:
+    return storage_dir / f"manual_{user_id}_{project_id}.pdf"
+
+
+def _video_progress_fields(user_id: int) -> dict[str, Any]:
+    watched, total = database.get_video_progress(user_id)
+    total = max(total, 1)
+    return {
+        "video_progress": round(watched / total, 2),
+        "videos_watched": watched,
+        "total_videos": total,
+    }
+
+
 @api_bp.get("/projects")
 @require_auth
 def list_projects() -> Response:
     user_id = g.current_user.id
     projects = database.list_user_projects(user_id)
-    watched_ids = database.get_watched_video_ids(user_id)
-    total_videos = max(database.total_videos(), 1)
-    video_progress = round(len(watched_ids) / total_videos, 2)
+    video_progress = _video_progress_fields(user_id)
 
+    missing: list[tuple[dict[str, Any], dict[str, Any]]] = []
     for project in projects:
         manual = (project.get("plan_data") or {}).get("manual") or {}
         if "recommended_videos" not in manual:
-            manual["recommended_videos"] = youtube_service.recommended_videos_for_project(
-                project.get("form_data", {})
-            )
             project.setdefault("plan_data", {})["manual"] = manual
-        project["video_progress"] = video_progress
-        project["videos_watched"] = len(watched_ids)
-        project["total_videos"] = total_videos
+            missing.append((project, manual))
+        project.update(video_progress)
+
+    # One catalog read covers every project that still needs a playlist.
+    playlists = youtube_service.recommended_videos_for_projects(
+        [project.get("form_data", {}) for project, _ in missing]
+    )
+    for (_, manual), playlist in zip(missing, playlists):
+        manual["recommended_videos"] = playlist
     return jsonify({"success": True, "projects": projects})
 
 
 @api_bp.get("/dashboard")
 @require_auth
 def dashboard() -> Response:
-    user_id = g.current_user.id
-    projects = database.list_user_projects(user_id)
-    watched_ids = database.get_watched_video_ids(user_id)
-    total_videos = max(database.total_videos(), 1)
+    bundle = database.get_dashboard_bundle(g.current_user.id)
+    projects = bundle["projects"]
+    latest_form_data = bundle["latest_form_data"]
+    watched_ids = bundle["watched_ids"]
+    total_videos = max(bundle["total_videos"], 1)
     progress = round(len(watched_ids) / total_videos, 2)
     recommended = youtube_service.recommended_videos_for_user(
         {
@@ -230,10 +269,9 @@ def dashboard() -> Response:
             "city": g.current_user.city,
             "project_type": g.current_user.project_type,
         },
-        projects,
+        [{"form_data": latest_form_data}] if latest_form_data is not None else [],
         watched_ids,
     )
-    hire_requests = database.list_hire_requests(user_id)
 
     return jsonify(
         {
@@ -252,7 +290,7 @@ def dashboard() -> Response:
                 "percentage": progress,
             },
             "recommended_videos": recommended,
-            "hire_requests": hire_requests,
+            "hire_requests": bundle["hire_requests"],
         }
     )
 
@@ -266,19 +304,20 @@ def create_project() -> tuple[Response, int]:
 
     project_title = payload.get("title") or f"Proyecto {project_data['ciudad']}"
     user_id = g.current_user.id
+    storage_dir: Path = current_app.config["PROJECT_STORAGE"]
+    storage_dir.mkdir(parents=True, exist_ok=True)
     project_id = database.create_user_project(
         user_id=user_id,
         title=project_title,
         form_data=project_data,
         plan_data=generated,
         viability=generated["viability"]["score"],
+        manual_path_for=lambda new_id: str(_manual_path(storage_dir, user_id, new_id)),
     )
 
-    storage_dir: Path = current_app.config["PROJECT_STORAGE"]
-    storage_dir.mkdir(parents=True, exist_ok=True)
-    manual_path = storage_dir / f"manual_{user_id}_{project_id}.pdf"
-    manual_builder.generate_manual_pdf(project_id, generated, manual_path)
-    database.set_project_manual_path(project_id, str(manual_path))
+    manual_path = _manual_path(storage_dir, user_id, project_id)
+    # The worker gets its own copy because the response fields are added below.
+    manual_builder.schedule_manual_pdf(project_id, dict(generated), manual_path)
 
     generated["project_id"] = project_id
     generated["manual_url"] = f"/api/projects/{project_id}/manual/pdf"
@@ -295,11 +334,7 @@ def get_project(project_id: int) -> tuple[Response, int]:
     project = database.get_user_project(project_id, user_id)
     if project is None:
         return jsonify({"success": False, "error": "Proyecto no encontrado"}), HTTPStatus.NOT_FOUND
-    watched_ids = database.get_watched_video_ids(user_id)
-    total_videos = max(database.total_videos(), 1)
-    project["video_progress"] = round(len(watched_ids) / total_videos, 2)
-    project["videos_watched"] = len(watched_ids)
-    project["total_videos"] = total_videos
+    project.update(_video_progress_fields(user_id))
     manual = (project.get("plan_data") or {}).get("manual") or {}
     if "recommended_videos" not in manual:
         manual["recommended_videos"] = youtube_service.recommended_videos_for_project(
@@ -320,13 +355,34 @@ def download_manual(project_id: int):
 
     manual_path = Path(project.get("manual_path") or "")
     storage_dir: Path = current_app.config["PROJECT_STORAGE"]
+    manual_builder.wait_for_manual_pdf(manual_path)
     if not manual_path.exists():
-        manual_path = storage_dir / f"manual_{user_id}_{project_id}.pdf"
+        manual_path = _manual_path(storage_dir, user_id, project_id)
         manual_builder.generate_manual_pdf(project_id, project["plan_data"], manual_path)
         database.set_project_manual_path(project_id, str(manual_path))
 
     database.record_manual_download(user_id, project_id)
-    return send_file(manual_path, download_name=f"manual_construyeseguro_{project_id}.pdf")
+    download_name = f"manual_construyeseguro_{project_id}.pdf"
+    accel_prefix = current_app.config.get("MANUAL_ACCEL_REDIRECT_PREFIX")
+    if accel_prefix:
+        # Nginx serves the file itself (sendfile) from an internal location
+        # and adds its own ETag/Last-Modified validators.
+        response = Response(mimetype="application/pdf")
+        response.headers["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{manual_path.name}"
+        response.headers.set("Content-Disposition", "inline", filename=download_name)
+        response.cache_control.max_age = MANUAL_PDF_MAX_AGE
+    else:
+        response = send_file(
+            manual_path,
+            download_name=download_name,
+            conditional=True,
+            etag=True,
+            max_age=MANUAL_PDF_MAX_AGE,
+        )
+    # Manuals are per-user; keep them out of shared caches.
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
 
 
 @api_bp.post("/plan")
@@ -360,35 +416,20 @@ def list_videos() -> Response:
     rows = database.list_videos(level=level_filter, category=category, stage=stage, search=search)
     watched_ids = database.get_watched_video_ids(g.current_user.id)
 
-    videos = [Video.from_row(row) for row in rows]
+    # Rows arrive filtered and ordered by (level_order, title), so each level
+    # is one contiguous run.
     grouped: list[dict[str, Any]] = []
-    for level_key in (level_filter,) if level_filter else VIDEO_LEVEL_ORDER.keys():
-        level_videos = [video for video in videos if video.level.lower() == level_key]
-        if not level_videos:
+    for level_key, level_rows in groupby(rows, key=lambda row: row["level"].lower()):
+        if level_filter is None and level_key not in VIDEO_LEVEL_ORDER:
             continue
-        level_videos.sort(key=lambda video: (VIDEO_LEVEL_ORDER.get(video.level.lower(), 99), video.title))
+        videos = [video_dict_from_row(row) for row in level_rows]
+        for video in videos:
+            video["watched"] = video["id"] in watched_ids
         grouped.append(
             {
                 "level": level_key,
                 "label": VIDEO_LEVEL_LABELS.get(level_key, level_key.title()),
-                "videos": [
-                    {
-                        "id": video.id,
-                        "title": video.title,
-                        "url": video.url,
-                        "watch_url": video.url,
-                        "embed_url": video.embed_url,
-                        "youtube_id": video.youtube_id,
-                        "level": video.level,
-                        "category": video.category,
-                        "stage": video.stage,
-                        "manual_step": video.manual_step,
-                        "description": video.description,
-                        "thumbnail": video.thumbnail_url,
-                        "watched": video.id in watched_ids,
-                    }
-                    for video in level_videos
-                ],
+                "videos": videos,
             }
         )
 
@@ -399,8 +440,8 @@ def list_videos() -> Response:
 @require_auth
 def track_video(video_id: int) -> tuple[Response, int]:
     database.record_video_watch(g.current_user.id, video_id)
-    watched = len(database.get_watched_video_ids(g.current_user.id))
-    total = max(database.total_videos(), 1)
+    watched, total = database.get_video_progress(g.current_user.id)
+    total = max(total, 1)
     progress = round(watched / total, 2)
     return (
         jsonify(
@@ -418,12 +459,32 @@ def track_video(video_id: int) -> tuple[Response, int]:
 # ---------------------------------------------------------------------------
 # Manual overview and marketplace utilities
 # ---------------------------------------------------------------------------
+# Encoded /manual/steps bodies and their ETags, keyed by level (None = all
+# levels, "?" = unknown level). Only the linked videos can change, so the
+# bodies are rebuilt every MANUAL_STEPS_TTL seconds.
+MANUAL_STEPS_TTL = 60.0
+_manual_steps_cache: dict[str | None, tuple[float, str, bytes]] = {}
+
+
 @api_bp.get("/manual/steps")
 @require_auth
 def manual_steps() -> Response:
-    level = request.args.get("level")
-    steps = manual_builder.build_manual_steps(level_filter=level)
-    return jsonify({"success": True, "steps": steps})
+    level = request.args.get("level") or None
+    key = level if level is None or level in VIDEO_LEVEL_ORDER else "?"
+    now = time.monotonic()
+    cached = _manual_steps_cache.get(key)
+    if cached is None or cached[0] <= now:
+        steps = manual_builder.build_manual_steps(level_filter=level)
+        body = current_app.json.dumps({"success": True, "steps": steps}).encode("utf-8")
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        cached = _manual_steps_cache[key] = (now + MANUAL_STEPS_TTL, etag, body)
+
+    _, etag, body = cached
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 @api_bp.get("/marketplace/providers")
@@ -441,39 +502,13 @@ def list_marketplace_providers() -> Response:
         except ValueError:
             return None
 
-    providers = [
-        Provider.from_row(row)
-        for row in database.list_providers(
-            city=city,
-            provider_type=provider_type,
-            price_min=_to_float(price_min),
-            price_max=_to_float(price_max),
-        )
-    ]
-
-    return jsonify(
-        {
-            "success": True,
-            "providers": [
-                {
-                    "id": provider.id,
-                    "name": provider.name,
-                    "type": provider.provider_type,
-                    "specialty": provider.specialty,
-                    "city": provider.city,
-                    "locality": provider.locality,
-                    "price_min": provider.price_min,
-                    "price_max": provider.price_max,
-                    "rating": provider.rating,
-                    "description": provider.description,
-                    "contact": provider.contact,
-                    "portfolio_url": provider.portfolio_url,
-                    "experience_years": provider.experience_years,
-                }
-                for provider in providers
-            ],
-        }
+    providers = database.list_providers_json(
+        city=city,
+        provider_type=provider_type,
+        price_min=_to_float(price_min),
+        price_max=_to_float(price_max),
     )
+    return Response(f'{{"success":true,"providers":{providers}}}', mimetype="application/json")
 
 
 @api_bp.post("/marketplace/hire")
@@ -524,20 +559,32 @@ def list_hires() -> Response:
     return jsonify({"success": True, "requests": hires})
 
 
+SAFETY_ALERTS = (
+    "Utiliza señalización perimetral y cinta de peligro durante toda la obra.",
+    "Verifica que el contratista cuente con equipo de seguridad personal (EPP).",
+    "Coordina con vecinos horarios de obra para minimizar molestias.",
+)
+# The payload never changes, so it is encoded once at import.
+_SAFETY_ALERTS_BODY = json.dumps(
+    {"success": True, "alerts": SAFETY_ALERTS}, ensure_ascii=False, separators=(",", ":")
+).encode("utf-8")
+
+
 @api_bp.get("/marketplace/alerts")
 def safety_alerts() -> Response:
-    alerts = [
-        "Utiliza señalización perimetral y cinta de peligro durante toda la obra.",
-        "Verifica que el contratista cuente con equipo de seguridad personal (EPP).",
-        "Coordina con vecinos horarios de obra para minimizar molestias.",
-    ]
-    return jsonify({"success": True, "alerts": alerts})
+    return Response(_SAFETY_ALERTS_BODY, mimetype="application/json")
+
+
+_SQL_TESTIMONIALS_JSON = (
+    "SELECT json_group_array(json_object('author', author, 'location', location, 'quote', quote)) "
+    "FROM testimonials"
+)
 
 
 @api_bp.get("/testimonials")
 def testimonials() -> Response:
-    rows = database.fetch_rows("SELECT author, location, quote FROM testimonials")
-    return jsonify({"success": True, "testimonials": rows})
+    testimonials = database.fetch_json_array(_SQL_TESTIMONIALS_JSON)
+    return Response(f'{{"success":true,"testimonials":{testimonials}}}', mimetype="application/json")
 
 
 @api_bp.get("/financing/products")
@@ -557,6 +604,36 @@ def simulate_financing() -> Response:
     return jsonify(simulation)
 
 
+@api_bp.get("/financing/simulate_grid")
+def simulate_financing_grid() -> Response:
+    def _parse_list(name: str, convert: type) -> list[Any]:
+        raw = request.args.get(name, "")
+        try:
+            return [convert(value) for value in raw.split(",") if value.strip()]
+        except ValueError:
+            raise ValueError(f"Valores inválidos en {name}") from None
+
+    simulations = financing.simulate_payment_grid(
+        amounts=_parse_list("amounts", float),
+        months=_parse_list("months", int),
+        rates=_parse_list("rates", float),
+    )
+    return jsonify({"success": True, "simulations": simulations})
+
+
+# ---------------------------------------------------------------------------
+# Request lifecycle
+# ---------------------------------------------------------------------------
+@api_bp.after_request
+def flush_pending_writes(response: Response) -> Response:
+    # Buffered writes are best effort here; a failure must not replace the response.
+    try:
+        database.flush_pending_watches()
+    except Exception:
+        current_app.logger.exception("Could not flush buffered watch events")
+    return response
+
+
 # ---------------------------------------------------------------------------
 # Error handling
 # ---------------------------------------------------------------------------
@@ -0,0 +1,168 @@
+-- ConstruyeSeguro schema; applied by database.init_db() on every start.
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    full_name TEXT,
+    city TEXT,
+    project_type TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    token TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS user_projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    form_data BLOB NOT NULL,
+    plan_data BLOB NOT NULL,
+    viability REAL NOT NULL,
+    manual_path TEXT,
+    status TEXT NOT NULL DEFAULT 'En preparación',
+    progress REAL NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS video_watch_history (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    video_id INTEGER NOT NULL,
+    watched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (user_id, video_id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS manual_downloads (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    project_id INTEGER NOT NULL,
+    downloaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (project_id) REFERENCES user_projects(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    form_data BLOB NOT NULL,
+    results BLOB NOT NULL,
+    viability REAL NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS architects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    specialty TEXT NOT NULL,
+    price_range TEXT NOT NULL,
+    city TEXT NOT NULL,
+    portfolio_url TEXT,
+    rating REAL NOT NULL DEFAULT 4.5
+);
+
+CREATE TABLE IF NOT EXISTS suppliers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    address TEXT NOT NULL,
+    city TEXT NOT NULL,
+    contact TEXT NOT NULL,
+    material_focus TEXT NOT NULL,
+    latitude REAL,
+    longitude REAL,
+    rating REAL NOT NULL DEFAULT 4.0
+);
+
+CREATE TABLE IF NOT EXISTS financing_products (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    rate REAL NOT NULL,
+    term_months INTEGER NOT NULL,
+    product_type TEXT NOT NULL,
+    requirements TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    category TEXT NOT NULL,
+    youtube_id TEXT NOT NULL,
+    level TEXT NOT NULL,
+    stage TEXT,
+    description TEXT NOT NULL,
+    manual_step TEXT,
+    tags TEXT,
+    level_order INTEGER GENERATED ALWAYS AS (
+        CASE LOWER(level) WHEN 'principiante' THEN 0 WHEN 'intermedio' THEN 1 WHEN 'avanzado' THEN 2 ELSE 3 END
+    ) VIRTUAL
+);
+
+CREATE TABLE IF NOT EXISTS providers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    provider_type TEXT NOT NULL,
+    specialty TEXT,
+    city TEXT NOT NULL,
+    locality TEXT,
+    price_min REAL,
+    price_max REAL,
+    rating REAL DEFAULT 4.6,
+    description TEXT,
+    contact TEXT,
+    portfolio_url TEXT,
+    experience_years INTEGER DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS project_hires (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    project_id INTEGER NOT NULL,
+    provider_id INTEGER NOT NULL,
+    message TEXT,
+    status TEXT NOT NULL DEFAULT 'pendiente',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (project_id) REFERENCES user_projects(id) ON DELETE CASCADE,
+    FOREIGN KEY (provider_id) REFERENCES providers(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS testimonials (
+    id INTEGER PRIMARY KEY,
+    author TEXT NOT NULL,
+    location TEXT NOT NULL,
+    quote TEXT NOT NULL
+);
+
+DROP INDEX IF EXISTS idx_user_projects_user;
+DROP INDEX IF EXISTS idx_videos_order;
+CREATE INDEX IF NOT EXISTS idx_up_user_created ON user_projects(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id);
+CREATE INDEX IF NOT EXISTS idx_manual_dl_user ON manual_downloads(user_id);
+CREATE INDEX IF NOT EXISTS idx_architects_city ON architects(city, specialty, rating);
+CREATE INDEX IF NOT EXISTS idx_suppliers_city ON suppliers(city, material_focus, rating);
+CREATE INDEX IF NOT EXISTS idx_financing_type ON financing_products(product_type, rate);
+CREATE INDEX IF NOT EXISTS idx_videos_level ON videos(level COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_videos_category ON videos(category COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_videos_stage ON videos(stage COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_providers_city ON providers(city COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_providers_type ON providers(provider_type COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_hires_user_created ON project_hires(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_hires_project ON project_hires(project_id);
+CREATE INDEX IF NOT EXISTS idx_hires_provider ON project_hires(provider_id);
+CREATE INDEX IF NOT EXISTS idx_manual_dl_project ON manual_downloads(project_id);
+CREATE INDEX IF NOT EXISTS idx_watch_video ON video_watch_history(video_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_videos_youtube ON videos(youtube_id);
+CREATE INDEX IF NOT EXISTS idx_videos_level_title ON videos(level_order, title);
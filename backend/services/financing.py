@@ -1,23 +1,27 @@
 """Financing helper functions."""
 from __future__ import annotations
 
-from typing import Any
+import math
+from itertools import chain, product
+from typing import Any, Sequence
 
 from .. import database
 
+# Upper bound on amount x months x rate combinations per grid request.
+MAX_GRID_POINTS = 500
 
-def get_financing_products(product_type: str | None = None) -> list[dict[str, Any]]:
-    query = (
-        "SELECT name, provider, rate, term_months, product_type, requirements FROM financing_products"
-    )
-    params: list[str] = []
 
-    if product_type:
-        query += " WHERE product_type = ?"
-        params.append(product_type)
+_PRODUCTS_QUERY = (
+    "SELECT name, provider, rate, term_months, product_type, requirements FROM financing_products"
+)
+_ALL_PRODUCTS_SQL = f"{_PRODUCTS_QUERY} ORDER BY rate ASC"
+_PRODUCTS_BY_TYPE_SQL = f"{_PRODUCTS_QUERY} WHERE product_type = ? ORDER BY rate ASC"
+
 
-    query += " ORDER BY rate ASC"
-    return database.fetch_rows(query, params)
+def get_financing_products(product_type: str | None = None) -> list[dict[str, Any]]:
+    if product_type:
+        return database.fetch_rows(_PRODUCTS_BY_TYPE_SQL, (product_type,))
+    return database.fetch_rows(_ALL_PRODUCTS_SQL)
 
 
 def simulate_payment_plan(amount: float, months: int, rate: float) -> dict[str, float]:
@@ -38,3 +42,52 @@ def simulate_payment_plan(amount: float, months: int, rate: float) -> dict[str,
         "total_paid": round(total_paid, 2),
         "interest_paid": round(interest_paid, 2),
     }
+
+
+def simulate_payment_grid(
+    amounts: Sequence[float],
+    months: Sequence[int],
+    rates: Sequence[float],
+) -> list[dict[str, float]]:
+    """Simulate every (amount, months, rate) combination in one call.
+
+    The annuity factor only depends on the term and rate, so it is computed
+    once per pair and reused for every amount. Results match
+    ``simulate_payment_plan`` exactly.
+    """
+    if not amounts or not months or not rates:
+        raise ValueError("Proporciona al menos un monto, un plazo y una tasa")
+    if len(amounts) * len(months) * len(rates) > MAX_GRID_POINTS:
+        raise ValueError(f"La simulación admite como máximo {MAX_GRID_POINTS} combinaciones")
+    if min(amounts) <= 0 or min(months) <= 0:
+        raise ValueError("Proporciona un monto y plazo válidos para la simulación")
+    if not all(math.isfinite(value) for value in chain(amounts, rates)) or min(rates) < 0:
+        raise ValueError("Proporciona montos y tasas válidos para la simulación")
+
+    results: list[dict[str, float]] = []
+    for term, rate in product(months, rates):
+        monthly_rate = rate / 100 / 12
+        try:
+            growth = (1 + monthly_rate) ** term
+        except OverflowError:
+            raise ValueError("La tasa o el plazo son demasiado grandes para la simulación") from None
+        for amount in amounts:
+            # Rates too small to move ``growth`` off 1.0 behave like a zero rate.
+            if monthly_rate == 0 or growth == 1:
+                payment = amount / term
+            else:
+                payment = amount * (monthly_rate * growth) / (growth - 1)
+            total_paid = payment * term
+            if not math.isfinite(total_paid):
+                raise ValueError("La tasa o el plazo son demasiado grandes para la simulación")
+            results.append(
+                {
+                    "amount": amount,
+                    "months": term,
+                    "rate": rate,
+                    "monthly_payment": round(payment, 2),
+                    "total_paid": round(total_paid, 2),
+                    "interest_paid": round(total_paid - amount, 2),
+                }
+            )
+    return results
@@ -1,13 +1,45 @@
 """Manual generation utilities, including PDF export."""
 from __future__ import annotations
 
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from textwrap import wrap
-from typing import Any
+from typing import Any, Iterator
 
 from .youtube_service import get_manual_videos
 
 LINE_WIDTH = 90
+PDF_LEADING = 14
+# The text starts at y=780 and stops once it reaches the 80pt bottom margin.
+PDF_MAX_LINES = -(-(780 - 80) // PDF_LEADING)
+# Fixed opening of every manual, one template per line (values may contain
+# newlines, which ``wrap`` folds into spaces, so the block is never split).
+_PDF_SUMMARY_TEMPLATE = (
+    "ConstruyeSeguro - Manual Constructivo",
+    "Proyecto #{project_id}",
+    "",
+    "Resumen del Proyecto:",
+    "  Terreno: {width}m x {length}m",
+    "  Niveles: {levels}",
+    "  Material principal: {material}",
+    "",
+    "Viabilidad estimada: {score:.0f}% - {message}",
+    "",
+    "Pasos principales:",
+)
+_PDF_ESCAPE = str.maketrans({"\\": "\\\\", "(": "\\(", ")": "\\)"})
+
+# Manuals for new projects are rendered off the request thread.
+PDF_WORKERS = 2
+
+_logger = logging.getLogger(__name__)
+_pdf_executor = ThreadPoolExecutor(max_workers=PDF_WORKERS, thread_name_prefix="manual-pdf")
+_pending_pdfs: dict[Path, Future[None]] = {}
+_pending_pdfs_lock = threading.Lock()
 
 
 def build_manual_steps(level_filter: str | None = None) -> list[dict[str, Any]]:
@@ -44,105 +76,114 @@ def generate_manual_pdf(
     """Generate a lightweight PDF manual for offline consultation."""
     destination.parent.mkdir(parents=True, exist_ok=True)
     contents = _compose_pdf_content(project_id, project_summary)
-    destination.write_bytes(contents)
+    # Write then rename so a concurrent download never sees a partial file.
+    # mkstemp names stay unique across worker processes rendering the same manual.
+    fd, partial = tempfile.mkstemp(dir=destination.parent, prefix=f"{destination.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(contents)
+        os.replace(partial, destination)
+    except BaseException:
+        Path(partial).unlink(missing_ok=True)
+        raise
+
+
+def schedule_manual_pdf(
+    project_id: int,
+    project_summary: dict[str, Any],
+    destination: Path,
+) -> None:
+    """Render the manual in a background worker; see ``wait_for_manual_pdf``."""
+    with _pending_pdfs_lock:
+        if destination in _pending_pdfs:
+            return
+        future = _pdf_executor.submit(generate_manual_pdf, project_id, project_summary, destination)
+        _pending_pdfs[destination] = future
+    future.add_done_callback(lambda done: _finish_manual_pdf(destination, done))
 
 
-def _compose_pdf_content(project_id: int, project_summary: dict[str, Any]) -> bytes:
-    lines = ["ConstruyeSeguro - Manual Constructivo", f"Proyecto #{project_id}", ""]
+def wait_for_manual_pdf(destination: Path) -> None:
+    """Block until a scheduled render of ``destination`` has finished."""
+    with _pending_pdfs_lock:
+        future = _pending_pdfs.get(destination)
+    if future is not None:
+        future.exception()
+
 
+def _finish_manual_pdf(destination: Path, future: Future[None]) -> None:
+    with _pending_pdfs_lock:
+        if _pending_pdfs.get(destination) is future:
+            del _pending_pdfs[destination]
+    error = future.exception()
+    if error is not None:
+        _logger.error("Manual PDF generation failed for %s", destination, exc_info=error)
+
+
+def _compose_pdf_content(project_id: int, project_summary: dict[str, Any]) -> bytes:
     overview = project_summary.get("overview", {})
     terrain = overview.get("terrain", {})
-    lines.extend(
-        [
-            "Resumen del Proyecto:",
-            f"  Terreno: {terrain.get('width', 0)}m x {terrain.get('length', 0)}m",
-            f"  Niveles: {overview.get('levels', 1)}",
-            f"  Material principal: {overview.get('material', '').title()}",
-            "",
-        ]
-    )
-
     viability = project_summary.get("viability", {})
-    lines.append(f"Viabilidad estimada: {viability.get('score', 0) * 100:.0f}% - {viability.get('message', '')}")
-    lines.append("")
+    values = {
+        "project_id": project_id,
+        "width": terrain.get("width", 0),
+        "length": terrain.get("length", 0),
+        "levels": overview.get("levels", 1),
+        "material": overview.get("material", "").title(),
+        "score": viability.get("score", 0) * 100,
+        "message": viability.get("message", ""),
+    }
+    lines = [template.format_map(values) for template in _PDF_SUMMARY_TEMPLATE]
 
-    lines.append("Pasos principales:")
     for step in project_summary.get("manual", {}).get("steps", []):
         lines.append(f"  Paso {step['step']}: {step['description']}")
         video = step.get("video") or {}
         if video:
             video_url = video.get("url") or f"https://www.youtube.com/watch?v={video.get('youtube_id')}"
             lines.append(f"    Video: {video_url}")
-    lines.append("")
-
-    lines.append("Materiales principales:")
-    for item in project_summary.get("materials", {}).get("items", []):
-        lines.append(
-            f"  - {item['name']} - {item['quantity']} {item['unit']} (Costo unitario: ${item['unit_cost']})"
-        )
-
+    lines += ("", "Materiales principales:")
+    lines.extend(
+        f"  - {item['name']} - {item['quantity']} {item['unit']} (Costo unitario: ${item['unit_cost']})"
+        for item in project_summary.get("materials", {}).get("items", [])
+    )
     return _build_pdf_from_lines(lines)
 
 
 def _build_pdf_from_lines(lines: list[str]) -> bytes:
-    wrapped_lines: list[str] = []
-    for line in lines:
-        wrapped_lines.extend(wrap(line, width=LINE_WIDTH) or [""])
-
-    y_position = 780
-    leading = 14
-    content_stream_lines = ["BT", "/F1 18 Tf", "72 800 Td", f"(ConstruyeSeguro) Tj", "T*", "T*", "/F1 12 Tf"]
-    for wrapped in wrapped_lines:
-        safe_text = _escape_pdf_text(wrapped)
-        content_stream_lines.append(f"({safe_text}) Tj")
-        content_stream_lines.append(f"0 -{leading} Td")
-        y_position -= leading
-        if y_position <= 80:
-            break
-    content_stream_lines.append("ET")
-    content_stream = "\n".join(content_stream_lines).encode("utf-8")
-
-    pdf_header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
-    objects: list[bytes] = []
-    offsets: list[int] = []
-    current_offset = len(pdf_header)
-
-    def add_object(payload: bytes) -> None:
-        nonlocal current_offset
-        offsets.append(current_offset)
-        if not payload.endswith(b"\n"):
-            payload += b"\n"
-        objects.append(payload)
-        current_offset += len(payload)
-
-    add_object(b"1 0 obj<< /Type /Catalog /Pages 2 0 R >>endobj")
-    add_object(b"2 0 obj<< /Type /Pages /Kids [3 0 R] /Count 1 >>endobj")
-    add_object(
-        (
-            "3 0 obj<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
-            "/Contents 4 0 R /Resources<< /Font<< /F1 5 0 R >> >> >>endobj"
-        ).encode("utf-8")
-    )
-    add_object(
-        f"4 0 obj<< /Length {len(content_stream)} >>stream\n".encode("utf-8")
-        + content_stream
-        + b"\nendstream\nendobj"
-    )
-    add_object(b"5 0 obj<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>endobj")
+    body = "".join(f"({text.translate(_PDF_ESCAPE)}) Tj\n0 -{PDF_LEADING} Td\n" for text in _page_lines(lines))
+    content_stream = f"BT\n/F1 18 Tf\n72 800 Td\n(ConstruyeSeguro) Tj\nT*\nT*\n/F1 12 Tf\n{body}ET".encode("utf-8")
 
-    xref_position = current_offset
-    xref_table = ["xref", "0 6", "0000000000 65535 f "]
+    pdf = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets: list[int] = []
+    for payload in (
+        b"1 0 obj<< /Type /Catalog /Pages 2 0 R >>endobj\n",
+        b"2 0 obj<< /Type /Pages /Kids [3 0 R] /Count 1 >>endobj\n",
+        b"3 0 obj<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Contents 4 0 R /Resources<< /Font<< /F1 5 0 R >> >> >>endobj\n",
+        b"4 0 obj<< /Length %d >>stream\n%s\nendstream\nendobj\n" % (len(content_stream), content_stream),
+        b"5 0 obj<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>endobj\n",
+    ):
+        offsets.append(len(pdf))
+        pdf += payload
+
+    xref_position = len(pdf)
+    pdf += b"xref\n0 6\n0000000000 65535 f "
     for offset in offsets:
-        xref_table.append(f"{offset:010d} 00000 n ")
-    trailer = [
-        "trailer<< /Size 6 /Root 1 0 R >>",
-        f"startxref\n{xref_position}",
-        "%%EOF",
-    ]
-
-    pdf_parts = [pdf_header] + objects + ["\n".join(xref_table).encode("utf-8"), "\n".join(trailer).encode("utf-8")]
-    return b"".join(pdf_parts)
+        pdf += b"\n%010d 00000 n " % offset
+    pdf += b"trailer<< /Size 6 /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF" % xref_position
+    return bytes(pdf)
 
 
-def _escape_pdf_text(text: str) -> str:
-    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+def _page_lines(lines: list[str]) -> Iterator[str]:
+    """Yield the wrapped lines that fit on the single manual page."""
+    remaining = PDF_MAX_LINES
+    for line in lines:
+        # Short single-spaced lines are what wrap() would return unchanged.
+        if len(line) <= LINE_WIDTH and line.isprintable() and not line.endswith(" ") and "  " not in line.lstrip(" "):
+            wrapped: list[str] = [line]
+        else:
+            wrapped = wrap(line, width=LINE_WIDTH) or [""]
+        for text in wrapped:
+            yield text
+            remaining -= 1
+            if not remaining:
+                return
@@ -13,44 +13,32 @@ SAFETY_ALERTS = [
 ]
 
 
-def get_architects(city: str | None = None, specialty: str | None = None) -> list[dict[str, Any]]:
-    query = "SELECT name, specialty, price_range, city, portfolio_url, rating FROM architects"
-    params: list[str] = []
-    filters: list[str] = []
-
-    if city:
-        filters.append("city = ?")
-        params.append(city)
-    if specialty:
-        filters.append("specialty = ?")
-        params.append(specialty)
+# Fixed query strings keep SQLite's per-connection statement cache warm and
+# ensure only vetted SQL ever reaches ``fetch_rows``.
+_ARCHITECT_QUERIES = database.build_query_variants(
+    "SELECT name, specialty, price_range, city, portfolio_url, rating FROM architects",
+    ("city = ?", "specialty = ?"),
+    "rating DESC",
+)
+_SUPPLIER_QUERIES = database.build_query_variants(
+    "SELECT name, address, city, contact, material_focus, latitude, longitude, rating FROM suppliers",
+    ("city = ?", "material_focus LIKE ?"),
+    "rating DESC",
+)
 
-    if filters:
-        query += " WHERE " + " AND ".join(filters)
 
-    query += " ORDER BY rating DESC"
-    return database.fetch_rows(query, params)
+def get_architects(city: str | None = None, specialty: str | None = None) -> list[dict[str, Any]]:
+    params = [value for value in (city, specialty) if value]
+    return database.fetch_rows(_ARCHITECT_QUERIES[bool(city), bool(specialty)], params)
 
 
 def get_suppliers(city: str | None = None, material: str | None = None) -> list[dict[str, Any]]:
-    query = (
-        "SELECT name, address, city, contact, material_focus, latitude, longitude, rating FROM suppliers"
-    )
     params: list[str] = []
-    filters: list[str] = []
-
     if city:
-        filters.append("city = ?")
         params.append(city)
     if material:
-        filters.append("material_focus LIKE ?")
         params.append(f"%{material}%")
-
-    if filters:
-        query += " WHERE " + " AND ".join(filters)
-
-    query += " ORDER BY rating DESC"
-    return database.fetch_rows(query, params)
+    return database.fetch_rows(_SUPPLIER_QUERIES[bool(city), bool(material)], params)
 
 
 def get_safety_alerts() -> list[str]:
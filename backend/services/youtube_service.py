@@ -1,14 +1,11 @@
 """Utility helpers to integrate YouTube content."""
 from __future__ import annotations
 
+import time
 from typing import Any, Iterable, Sequence
 
 from .. import database
-from ..models import (
-    build_youtube_embed_url,
-    build_youtube_thumbnail_url,
-    build_youtube_watch_url,
-)
+from ..models import youtube_urls
 
 
 LEVEL_ALIASES = {
@@ -28,6 +25,14 @@ STAGE_KEYWORDS: dict[str, set[str]] = {
 STAGE_ORDER: Sequence[str] = tuple(STAGE_KEYWORDS.keys())
 DEFAULT_STAGE = "Aprendizaje complementario"
 
+# Recommendations reuse one grouped catalog snapshot for this long; playlists
+# for users without watch history are memoized per priority-target set.
+CATALOG_CACHE_TTL = 60.0
+
+_GroupedCatalog = dict[str, list[dict[str, Any]]]
+_PlaylistMemo = dict[frozenset[str], list[dict[str, Any]]]
+_catalog_snapshot: tuple[float, _GroupedCatalog, _PlaylistMemo] | None = None
+
 
 def list_videos(
     *,
@@ -84,7 +89,43 @@ def recommended_videos_for_project(
 ) -> list[dict[str, Any]]:
     """Build a playlist tailored to the project configuration."""
 
-    watched = set(watched_ids or [])
+    return recommended_videos_for_projects([form_data], watched_ids)[0]
+
+
+def recommended_videos_for_projects(
+    form_datas: Sequence[dict[str, Any]],
+    watched_ids: Iterable[int] | None = None,
+) -> list[list[dict[str, Any]]]:
+    """Build one playlist per project while reading the catalog only once."""
+
+    if not form_datas:
+        return []
+    watched = watched_ids if isinstance(watched_ids, frozenset) else frozenset(watched_ids or ())
+    grouped, playlists = _catalog_for_recommendations()
+    results: list[list[dict[str, Any]]] = []
+    for form_data in form_datas:
+        targets = frozenset(_priority_targets(form_data))
+        if watched:
+            results.append(_build_playlist(grouped, targets, watched))
+            continue
+        playlist = playlists.get(targets)
+        if playlist is None:
+            playlist = playlists[targets] = _build_playlist(grouped, targets, watched)
+        results.append(playlist)
+    return results
+
+
+def _catalog_for_recommendations() -> tuple[_GroupedCatalog, _PlaylistMemo]:
+    """Return the grouped catalog and its playlist memo, refreshed every CATALOG_CACHE_TTL."""
+    global _catalog_snapshot
+    now = time.monotonic()
+    snapshot = _catalog_snapshot
+    if snapshot is None or snapshot[0] <= now:
+        snapshot = _catalog_snapshot = (now + CATALOG_CACHE_TTL, group_videos_by_stage(), {})
+    return snapshot[1], snapshot[2]
+
+
+def _priority_targets(form_data: dict[str, Any]) -> set[str]:
     priority_targets: set[str] = set()
     levels = int(form_data.get("plantas") or 1)
     spaces = {space.lower() for space in form_data.get("espacios", [])}
@@ -115,7 +156,14 @@ def recommended_videos_for_project(
     if "patio" in spaces:
         priority_targets.add("drenaje")
 
-    grouped = group_videos_by_stage()
+    return priority_targets
+
+
+def _build_playlist(
+    grouped: dict[str, list[dict[str, Any]]],
+    priority_targets: frozenset[str],
+    watched: frozenset[int],
+) -> list[dict[str, Any]]:
     playlist: list[dict[str, Any]] = []
     for stage in STAGE_ORDER:
         videos = grouped.get(stage, [])
@@ -153,10 +201,8 @@ def recommended_videos_for_user(
 
 def _enrich_video(video: dict[str, Any]) -> dict[str, Any]:
     youtube_id = str(video.get("youtube_id", ""))
-    video["url"] = build_youtube_watch_url(youtube_id)
+    video["url"], video["embed_url"], video["thumbnail"] = youtube_urls(youtube_id)
     video["watch_url"] = video["url"]
-    video["embed_url"] = build_youtube_embed_url(youtube_id)
-    video["thumbnail"] = build_youtube_thumbnail_url(youtube_id)
     return video
 
 
@@ -187,8 +233,8 @@ def _video_targets(video: dict[str, Any]) -> set[str]:
 
 def _prioritize_videos(
     videos: list[dict[str, Any]],
-    priority_targets: set[str],
-    watched_ids: set[int],
+    priority_targets: frozenset[str],
+    watched_ids: frozenset[int],
     *,
     limit: int = 3,
 ) -> list[dict[str, Any]]:
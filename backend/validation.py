@@ -59,6 +59,10 @@ ALLOWED_VALUES = {
     "iluminacion": ["natural", "mixta", "artificial"],
 }
 
+# Hashed copies of ALLOWED_VALUES for O(1) membership checks.
+_ALLOWED_SETS = {field: frozenset(values) for field, values in ALLOWED_VALUES.items()}
+_LIST_FIELDS = frozenset({"necesidades", "preferencias", "espacios"})
+
 REQUIRED_FIELDS = [
     "presupuesto",
     "largo_terreno",
@@ -80,12 +84,12 @@ def validate_project_payload(payload: dict[str, Any]) -> dict[str, Any]:
 
     validated: dict[str, Any] = {}
 
-    for field, allowed in ALLOWED_VALUES.items():
-        if field in {"necesidades", "preferencias", "espacios"}:
+    for field, allowed in _ALLOWED_SETS.items():
+        if field in _LIST_FIELDS:
             values = payload.get(field, [])
             if not isinstance(values, list):
                 raise ValueError(f"El campo {field} debe ser una lista")
-            invalid = [value for value in values if value not in allowed]
+            invalid = [value for value in values if not _is_allowed(value, allowed)]
             if invalid:
                 raise ValueError(f"Valores inválidos en {field}: {', '.join(invalid)}")
             validated[field] = values
@@ -93,7 +97,7 @@ def validate_project_payload(payload: dict[str, Any]) -> dict[str, Any]:
             value = payload.get(field)
             if value is None:
                 continue
-            if value not in allowed:
+            if not _is_allowed(value, allowed):
                 raise ValueError(f"Valor inválido para {field}: {value}")
             validated[field] = value
 
@@ -103,6 +107,13 @@ def validate_project_payload(payload: dict[str, Any]) -> dict[str, Any]:
     return validated
 
 
+def _is_allowed(value: Any, allowed: frozenset[Any]) -> bool:
+    try:
+        return value in allowed
+    except TypeError:  # unhashable input (e.g. a list) is never an allowed value
+        return False
+
+
 def _validate_boundary(boundary: Any) -> dict[str, Any]:
     if not isinstance(boundary, dict):
         raise ValueError("El contorno del terreno debe ser un objeto GeoJSON")